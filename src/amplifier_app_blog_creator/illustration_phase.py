@@ -23,8 +23,13 @@ logger = logging.getLogger(__name__)
 class IllustrationPhase:
     """Orchestrates content-aware image generation and insertion for blog posts."""
 
-    def __init__(self):
-        """Initialize illustration phase."""
+    def __init__(self, anthropic_api_key: str | None = None):
+        """Initialize illustration phase.
+
+        Args:
+            anthropic_api_key: Key for prompt generation (default: ANTHROPIC_API_KEY)
+        """
+        self.anthropic_api_key = anthropic_api_key
         self.image_generator = ImageGenerator()
         self.openai_client = OpenAI()
 
@@ -385,7 +390,7 @@ Return JSON with:
   }}
 }}"""
 
-        client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = AsyncAnthropic(api_key=self.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY"))
 
         response = await client.messages.create(
             model="claude-3-5-haiku-20241022",
@@ -0,0 +1,40 @@
+"""Compact JSON encoding and decoding, using orjson when it is installed.
+
+orjson is an optional speedup: it encodes straight to bytes and parses
+faster than the stdlib. Without it these fall back to stdlib json with
+the same compact output.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Falls back to stdlib json
+
+
+def dumps(data: Any, ensure_ascii: bool = False) -> bytes:
+    """Serialize data to compact UTF-8 JSON bytes.
+
+    Args:
+        data: Data to serialize
+        ensure_ascii: Escape non-ASCII characters (always uses stdlib json)
+
+    Raises:
+        TypeError: If data is not JSON serializable
+    """
+    if orjson is not None and not ensure_ascii:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=ensure_ascii, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -8,11 +8,13 @@ Consolidates session management from blog_writer and article_illustrator
 into a unified session model supporting both content and illustration phases.
 """
 
+import functools
 import logging
 import re
 from dataclasses import asdict
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import fields
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -23,6 +25,11 @@ from .vendored_toolkit import write_json
 
 logger = logging.getLogger(__name__)
 
+# slugify() patterns, compiled once
+_SLUG_SPACES_RE = re.compile(r"[\s_]+")
+_SLUG_INVALID_RE = re.compile(r"[^a-z0-9-]")
+_SLUG_DASHES_RE = re.compile(r"-+")
+
 
 def extract_title_from_markdown(content: str) -> str | None:
     """Extract the first H1 heading from markdown content.
@@ -41,9 +48,12 @@ def extract_title_from_markdown(content: str) -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
     """Convert text to a URL-friendly slug.
 
+    Pure function of its input, so results are cached.
+
     Args:
         text: Text to slugify
 
@@ -51,9 +61,9 @@ def slugify(text: str) -> str:
         Slugified string (lowercase, dashes for spaces, no special chars)
     """
     slug = text.lower()
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"[^a-z0-9-]", "", slug)
-    slug = re.sub(r"-+", "-", slug)
+    slug = _SLUG_SPACES_RE.sub("-", slug)
+    slug = _SLUG_INVALID_RE.sub("", slug)
+    slug = _SLUG_DASHES_RE.sub("-", slug)
     slug = slug.strip("-")
     return slug
 
@@ -86,6 +96,10 @@ class SessionState:
     style_review: dict[str, Any] = field(default_factory=dict)
     user_feedback: list[dict[str, Any]] = field(default_factory=list)
     iteration_history: list[dict[str, Any]] = field(default_factory=list)
+    workflow_complete: bool = False  # Set when the recipe run succeeds (web mode)
+    final_slug: str | None = None  # Set when the draft is approved (web mode)
+    final_path: str | None = None
+    final_word_count: int | None = None
 
     # Phase 2: Illustration
     illustration_enabled: bool = False
@@ -104,6 +118,11 @@ class SessionState:
     style_params: dict[str, Any] = field(default_factory=dict)
 
 
+# Names SessionManager.update() may set; hasattr() would also admit
+# methods and dunders such as __class__ or __dict__
+_SESSION_STATE_FIELDS = frozenset(f.name for f in fields(SessionState))
+
+
 class SessionManager:
     """Manages session state with automatic persistence.
 
@@ -126,11 +145,19 @@ class SessionManager:
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self.state_file = self.session_dir / "state.json"
         self.state = self._load_state()
+        self.state_mtime_ns = self._state_file_mtime_ns()
 
         # Save initial state if this is a new session
-        if not self.state_file.exists():
+        if self.state_mtime_ns is None:
             self.save()
 
+    def _state_file_mtime_ns(self) -> int | None:
+        """Modification time of the state file, or None if it doesn't exist."""
+        try:
+            return self.state_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
     def _load_state(self) -> SessionState:
         """Load state from file or create new."""
         if self.state_file.exists():
@@ -152,11 +179,29 @@ class SessionManager:
 
         try:
             state_dict = asdict(self.state)
-            write_json(state_dict, self.state_file)
+            # Machine-read and rewritten after every step; drafts are also saved as .md
+            write_json(state_dict, self.state_file, compact=True)
+            self.state_mtime_ns = self._state_file_mtime_ns()
             logger.debug(f"State saved to: {self.state_file}")
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
+    def update(self, **fields: Any) -> None:
+        """Set several state fields and save them in a single write.
+
+        Args:
+            **fields: SessionState field names and their new values
+
+        Raises:
+            AttributeError: If any name isn't a SessionState field; no field is changed
+        """
+        unknown = [name for name in fields if name not in _SESSION_STATE_FIELDS]
+        if unknown:
+            raise AttributeError(f"SessionState has no field {unknown[0]!r}")
+        for name, value in fields.items():
+            setattr(self.state, name, value)
+        self.save()
+
     def update_stage(self, stage: str) -> None:
         """Update workflow stage and save."""
         old_stage = self.state.stage
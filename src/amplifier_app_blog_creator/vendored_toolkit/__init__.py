@@ -12,7 +12,10 @@ becomes available as a proper package.
 """
 
 # File operations with cloud-sync retry logic
+from .file_ops import aappend_jsonl
 from .file_ops import append_jsonl
+from .file_ops import aread_json
+from .file_ops import awrite_json
 from .file_ops import discover_files
 from .file_ops import read_json
 from .file_ops import safe_read_text
@@ -44,6 +47,9 @@ __all__ = [
     "discover_files",
     "validate_path_exists",
     "append_jsonl",
+    "aread_json",
+    "awrite_json",
+    "aappend_jsonl",
     # Progress
     "ProgressReporter",
     "SimpleSpinner",
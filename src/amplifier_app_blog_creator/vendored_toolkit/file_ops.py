@@ -5,14 +5,37 @@ Safe, consistent file handling with retry logic for cloud-synced and network dri
 Provides robust operations that handle transient I/O errors gracefully.
 """
 
+import asyncio
 import contextlib
 import json
 import logging
+import os
+import stat
+import tempfile
 import time
 from pathlib import Path
 
+from ..json_codec import dumps
+from ..json_codec import loads
+
 logger = logging.getLogger(__name__)
 
+# Shared encoder for JSONL records (json.dumps with options builds a new one per call)
+_JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# Process umask, read once (os.umask can only be read by setting it);
+# mkstemp creates 0600 files, so replacements get a normal file mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Characters that make a glob pattern non-literal
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_wildcards(pattern: str) -> bool:
+    """Check whether a glob pattern contains any wildcard characters."""
+    return not _GLOB_CHARS.isdisjoint(pattern)
+
 
 def discover_files(base_path: Path, pattern: str = "**/*.md", max_items: int | None = None) -> list[Path]:
     """Discover files recursively with pattern.
@@ -38,10 +61,27 @@ def discover_files(base_path: Path, pattern: str = "**/*.md", max_items: int | N
     if not base_path.is_dir():
         raise ValueError(f"Path is neither file nor directory: {base_path}")
 
+    # Literal pattern (no wildcards): direct lookup instead of a directory scan
+    if not _has_wildcards(pattern):
+        candidate = base_path / pattern
+        return [candidate] if candidate.is_file() else []
+
     # Ensure pattern is recursive
     if not pattern.startswith("**"):
         logger.warning(f"Pattern '{pattern}' is not recursive. Consider using '**/{pattern}'")
 
+    # Move leading literal directories (e.g. "docs/blog/" in "docs/blog/**/*.md")
+    # onto the base so only the wildcard tail is globbed
+    parts = pattern.split("/")
+    literal_count = 0
+    while literal_count < len(parts) - 1 and not _has_wildcards(parts[literal_count]):
+        literal_count += 1
+    if literal_count:
+        base_path = base_path.joinpath(*parts[:literal_count])
+        pattern = "/".join(parts[literal_count:])
+        if not base_path.is_dir():
+            return []
+
     files = list(base_path.glob(pattern))
 
     # Sort for consistent ordering across runs
@@ -59,6 +99,7 @@ def write_json(
     ensure_ascii: bool = False,
     indent: int = 2,
     max_retries: int = 3,
+    compact: bool = False,
 ) -> None:
     """Write JSON with error handling and retry logic.
 
@@ -72,6 +113,8 @@ def write_json(
         ensure_ascii: Whether to escape non-ASCII characters
         indent: JSON indentation (None for compact)
         max_retries: Maximum retry attempts for I/O errors
+        compact: Write minimal JSON (no indent or separator spaces) for
+            machine-read files; faster to encode and fewer bytes to sync
 
     Raises:
         OSError: If write fails after all retries
@@ -80,22 +123,39 @@ def write_json(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Use temporary file for atomic write
-    temp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    # Serialize once, in one call (json.dump to a file goes through the
+    # pure-Python chunked encoder), then write the bytes in one go
+    if compact:
+        payload = dumps(data, ensure_ascii=ensure_ascii)
+    else:
+        payload = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8")
+
+    # Keep the target's mode across the replace (a new file gets the umask default)
+    try:
+        mode = stat.S_IMODE(output_path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
     retry_delay = 0.5
 
     for attempt in range(max_retries):
+        # Unique temp file per attempt so concurrent writers never share one
+        fd, temp_name = tempfile.mkstemp(prefix=output_path.name + ".", suffix=".tmp", dir=output_path.parent)
+        temp_path = Path(temp_name)
         try:
             # Write to temp file
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
-                f.flush()  # Ensure data is written to disk
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.chmod(temp_path, mode)
 
             # Atomic rename (on POSIX systems)
-            temp_path.replace(output_path)
+            os.replace(temp_path, output_path)
             return
 
         except OSError as e:
+            # Clean up temp file before retrying or re-raising
+            with contextlib.suppress(OSError):
+                temp_path.unlink()
             if e.errno == 5 and attempt < max_retries - 1:  # I/O error
                 if attempt == 0:  # Log warning on first retry
                     logger.warning(
@@ -106,17 +166,12 @@ def write_json(
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
-                # Clean up temp file if it exists
-                if temp_path.exists():
-                    with contextlib.suppress(OSError):
-                        temp_path.unlink()
                 raise
 
         except Exception:
             # Clean up temp file on any other error
-            if temp_path.exists():
-                with contextlib.suppress(OSError):
-                    temp_path.unlink()
+            with contextlib.suppress(OSError):
+                temp_path.unlink()
             raise
 
     # If we get here without exception, write succeeded
@@ -142,15 +197,12 @@ def read_json(path: Path, max_retries: int = 3) -> dict | list:
         OSError: If read fails after all retries
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"File does not exist: {path}")
-
     retry_delay = 0.5
 
     for attempt in range(max_retries):
         try:
-            with open(path, encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                return loads(f.read())
 
         except OSError as e:
             if e.errno == 5 and attempt < max_retries - 1:  # I/O error
@@ -171,12 +223,13 @@ def read_json(path: Path, max_retries: int = 3) -> dict | list:
     raise RuntimeError(f"Failed to read {path} after {max_retries} attempts")
 
 
-def validate_path_exists(path: Path, path_type: str = "path") -> Path:
+def validate_path_exists(path: Path, path_type: str = "path", follow_symlinks: bool = True) -> Path:
     """Validate that a path exists with clear error message.
 
     Args:
         path: Path to validate
         path_type: Description for error message (e.g., "input file", "config")
+        follow_symlinks: Whether a symlink must resolve (False accepts the link itself)
 
     Returns:
         The validated Path object
@@ -185,8 +238,10 @@ def validate_path_exists(path: Path, path_type: str = "path") -> Path:
         ValueError: If path doesn't exist
     """
     path = Path(path)
-    if not path.exists():
-        raise ValueError(f"{path_type.capitalize()} does not exist: {path}")
+    try:
+        path.stat(follow_symlinks=follow_symlinks)
+    except OSError:
+        raise ValueError(f"{path_type.capitalize()} does not exist: {path}") from None
     return path
 
 
@@ -206,9 +261,6 @@ def safe_read_text(path: Path, encoding: str = "utf-8", max_retries: int = 3) ->
         OSError: If read fails after all retries
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"File does not exist: {path}")
-
     retry_delay = 0.5
 
     for attempt in range(max_retries):
@@ -282,7 +334,7 @@ def append_jsonl(record: dict, path: Path, max_retries: int = 3) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
     retry_delay = 0.5
-    json_line = json.dumps(record, ensure_ascii=False) + "\n"
+    json_line = _JSONL_ENCODER.encode(record) + "\n"
 
     for attempt in range(max_retries):
         try:
@@ -302,3 +354,30 @@ def append_jsonl(record: dict, path: Path, max_retries: int = 3) -> None:
 
     # Unreachable but required by linter
     raise RuntimeError(f"Failed to append to {path} after {max_retries} attempts")
+
+
+# Async variants for event-loop callers (e.g. the web UI). Each runs the
+# synchronous helper in a worker thread so retry sleeps and slow
+# cloud-synced I/O don't block other requests.
+
+
+async def aread_json(path: Path, max_retries: int = 3) -> dict | list:
+    """Async variant of read_json that runs in a worker thread."""
+    return await asyncio.to_thread(read_json, path, max_retries)
+
+
+async def awrite_json(
+    data: dict | list,
+    output_path: Path,
+    ensure_ascii: bool = False,
+    indent: int = 2,
+    max_retries: int = 3,
+    compact: bool = False,
+) -> None:
+    """Async variant of write_json that runs in a worker thread."""
+    await asyncio.to_thread(write_json, data, output_path, ensure_ascii, indent, max_retries, compact)
+
+
+async def aappend_jsonl(record: dict, path: Path, max_retries: int = 3) -> None:
+    """Async variant of append_jsonl that runs in a worker thread."""
+    await asyncio.to_thread(append_jsonl, record, path, max_retries)
@@ -45,8 +45,8 @@ class ProgressReporter:
         self.description = description
         self.show_items = show_items
         self.log_interval = log_interval
-        self.start_time = time.time()
-        self.last_log_time = time.time()
+        self.start_time = time.monotonic()
+        self.last_log_time = self.start_time
 
         # Log initial status
         if self.total > 0:
@@ -60,29 +60,30 @@ class ProgressReporter:
         """
         self.current += 1
 
+        # Log at intervals or when complete (also every 10 seconds);
+        # skip all formatting work otherwise
+        now = time.monotonic()
+        if self.current % self.log_interval and self.current != self.total and now - self.last_log_time <= 10:
+            return
+
+        self.last_log_time = now
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         # Calculate percentage
         if self.total > 0:
             percentage = (self.current / self.total) * 100
         else:
             percentage = 0
 
-        # Log at intervals or when complete
-        should_log = (
-            self.current % self.log_interval == 0
-            or self.current == self.total
-            or (time.time() - self.last_log_time) > 10  # Also log every 10 seconds
-        )
-
-        if should_log:
-            if self.show_items and item_name:
-                logger.info(f"{self.description} [{self.current}/{self.total}] ({percentage:.1f}%): {item_name}")
-            else:
-                logger.info(f"{self.description} [{self.current}/{self.total}] ({percentage:.1f}%)")
-            self.last_log_time = time.time()
+        if self.show_items and item_name:
+            logger.info(f"{self.description} [{self.current}/{self.total}] ({percentage:.1f}%): {item_name}")
+        else:
+            logger.info(f"{self.description} [{self.current}/{self.total}] ({percentage:.1f}%)")
 
     def complete(self) -> None:
         """Mark processing complete and log summary."""
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
 
         # Format elapsed time
         if elapsed < 60:
@@ -127,7 +128,7 @@ class ProgressReporter:
         if self.current == 0 or self.current >= self.total:
             return None
 
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
         rate = self.current / elapsed
         remaining_items = self.total - self.current
         remaining_seconds = remaining_items / rate
@@ -165,8 +166,8 @@ class SimpleSpinner:
         """
         self.description = description
         self.counter = 0
-        self.start_time = time.time()
-        self.last_update = 0
+        self.start_time = time.monotonic()
+        self.last_update = float("-inf")
         logger.info(f"{description}...")
 
     def spin(self, update_interval: float = 5.0) -> None:
@@ -176,12 +177,15 @@ class SimpleSpinner:
             update_interval: Seconds between activity logs
         """
         self.counter += 1
-        current_time = time.time()
+        current_time = time.monotonic()
+
+        if current_time - self.last_update <= update_interval:
+            return
 
-        if current_time - self.last_update > update_interval:
+        self.last_update = current_time
+        if logger.isEnabledFor(logging.INFO):
             elapsed = current_time - self.start_time
             logger.info(f"  ...still {self.description.lower()} ({self.counter} items, {elapsed:.1f}s)")
-            self.last_update = current_time
 
     def stop(self, message: str | None = None) -> None:
         """Stop spinner and log final message.
@@ -189,7 +193,7 @@ class SimpleSpinner:
         Args:
             message: Optional completion message
         """
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
 
         if message:
             logger.info(f"✓ {message} ({elapsed:.1f}s)")
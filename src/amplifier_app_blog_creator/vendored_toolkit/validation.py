@@ -5,19 +5,31 @@ Common validation patterns for CLI tools.
 Provides clear, consistent error messages for input validation.
 """
 
+import functools
 import logging
+import os
+import stat
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
-def validate_input_path(path: Path, must_exist: bool = True, must_be_dir: bool = False) -> bool:
+def _is_empty_dir(path: Path) -> bool:
+    """Check for an empty directory without listing all of its entries."""
+    with os.scandir(path) as entries:
+        return next(entries, None) is None
+
+
+def validate_input_path(
+    path: Path, must_exist: bool = True, must_be_dir: bool = False, follow_symlinks: bool = True
+) -> bool:
     """Validate input path with specific requirements.
 
     Args:
         path: Path to validate
         must_exist: Whether the path must exist
         must_be_dir: Whether the path must be a directory
+        follow_symlinks: Whether to validate a symlink's target (False checks the link itself)
 
     Returns:
         True if valid
@@ -31,24 +43,30 @@ def validate_input_path(path: Path, must_exist: bool = True, must_be_dir: bool =
     """
     path = Path(path)
 
-    if must_exist and not path.exists():
-        raise ValueError(f"Path does not exist: {path}")
+    # Single stat answers both "exists" and "is a directory"
+    try:
+        is_dir = stat.S_ISDIR(path.stat(follow_symlinks=follow_symlinks).st_mode)
+    except OSError:
+        if must_exist:
+            raise ValueError(f"Path does not exist: {path}") from None
+        return True
 
-    if must_be_dir and path.exists() and not path.is_dir():
+    if must_be_dir and not is_dir:
         raise ValueError(f"Path must be a directory: {path}")
 
-    if path.exists() and path.is_dir() and not list(path.iterdir()):
+    if is_dir and _is_empty_dir(path):
         logger.warning(f"Directory is empty: {path}")
 
     return True
 
 
-def validate_output_path(path: Path, allow_overwrite: bool = True) -> bool:
+def validate_output_path(path: Path, allow_overwrite: bool = True, follow_symlinks: bool = True) -> bool:
     """Validate output path can be created or overwritten.
 
     Args:
         path: Output path to validate
         allow_overwrite: Whether existing files can be overwritten
+        follow_symlinks: Whether to validate a symlink's target (False checks the link itself)
 
     Returns:
         True if valid
@@ -62,20 +80,27 @@ def validate_output_path(path: Path, allow_overwrite: bool = True) -> bool:
     """
     path = Path(path)
 
+    # Single stat for existence and type checks below
+    try:
+        st = path.stat(follow_symlinks=follow_symlinks)
+    except OSError:
+        st = None
+    exists = st is not None
+
     # Check if path is a directory
-    if path.exists() and path.is_dir():
+    if st is not None and stat.S_ISDIR(st.st_mode):
         raise ValueError(f"Output path is a directory: {path}")
 
-    # Check if parent directory exists
-    if not path.parent.exists():
+    # Check if parent directory exists (only needed when the path itself is missing)
+    if not exists and not path.parent.exists():
         raise ValueError(f"Output directory does not exist: {path.parent}")
 
     # Check overwrite permission
-    if path.exists() and not allow_overwrite:
+    if exists and not allow_overwrite:
         raise ValueError(f"Output file already exists and overwrite not allowed: {path}")
 
     # Warn about overwrite
-    if path.exists() and allow_overwrite:
+    if exists and allow_overwrite:
         logger.warning(f"Output file will be overwritten: {path}")
 
     return True
@@ -106,6 +131,20 @@ def validate_minimum_files(files: list, minimum: int, file_type: str = "files")
     return True
 
 
+@functools.lru_cache(maxsize=128)
+def _classify_pattern(pattern: str) -> tuple[bool, bool, bool]:
+    """Classify a glob pattern once per unique pattern.
+
+    Returns:
+        (recursive, overly_complex, bare_path) flags used by validate_pattern
+    """
+    return (
+        pattern.startswith("**"),
+        pattern.count("*") > 4,
+        "/" in pattern and not pattern.startswith("**/"),
+    )
+
+
 def validate_pattern(pattern: str) -> bool:
     """Validate glob pattern is properly formatted.
 
@@ -127,15 +166,17 @@ def validate_pattern(pattern: str) -> bool:
     if not pattern:
         raise ValueError("Pattern cannot be empty")
 
+    recursive, overly_complex, bare_path = _classify_pattern(pattern)
+
     # Warn about non-recursive patterns
-    if not pattern.startswith("**"):
+    if not recursive:
         logger.warning(f"Pattern '{pattern}' is not recursive. Consider using '**/{pattern}' to search subdirectories")
 
     # Check for common mistakes
-    if pattern.count("*") > 4:
+    if overly_complex:
         logger.warning(f"Pattern may be overly complex: {pattern}")
 
-    if "/" in pattern and not pattern.startswith("**/"):
+    if bare_path:
         logger.warning(f"Pattern includes path but isn't recursive: {pattern}")
 
     return True
@@ -1,15 +1,22 @@
 """FastAPI application for blog creator web interface."""
 
+import asyncio
 import logging
+import os
+import webbrowser
 from contextlib import asynccontextmanager
 from pathlib import Path
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi import Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
+from .recipe_executor import RecipeExecutor
 from .routes import configuration
 from .routes import content
 from .routes import illustrations
@@ -21,22 +28,124 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Set by the web entry point when the browser should open on startup
+BROWSER_URL_ENV = "BLOG_CREATOR_BROWSER_URL"
+
+# How long to wait for the server to accept connections before opening
+# the browser anyway
+BROWSER_WAIT_SECONDS = 5.0
+
+# ZIP exports are already compressed; image routes are matched on "/images/"
+UNCOMPRESSED_PATH_SUFFIXES = ("/download-zip",)
+
+
+# Templates compiled at startup rather than by the first request to use
+# them; progress.html, setup.html and review.html are loaded by their routes
+PREWARM_TEMPLATES = (
+    "base.html",
+    "components/header.html",
+    "components/footer.html",
+    "components/stage-indicator.html",
+    "configuration.html",
+    "complete.html",
+)
+
+
+def prewarm():
+    """Compile page templates and parse the workflow recipe ahead of the first request."""
+    for name in PREWARM_TEMPLATES:
+        templates.get_template(name)
+    try:
+        # Caches the recipe's stage names and the amplifier CLI lookup
+        RecipeExecutor(progress.RECIPE_PATH)
+    except RuntimeError as e:
+        logger.warning(f"Could not prewarm recipe executor: {e}")
+
+
+def open_browser(url: str):
+    """Open browser to the running server."""
+    try:
+        webbrowser.open(url)
+        logger.info(f"Opened browser to {url}")
+    except Exception as e:
+        logger.warning(f"Could not auto-open browser: {e}")
+        print(f"\n🌐 Open your browser to: {url}\n")
+
+
+async def open_browser_when_listening(url: str):
+    """Open the browser once the server accepts connections at url.
+
+    uvicorn runs the lifespan startup before it binds its socket, so the
+    port is polled rather than assumed to be open.
+    """
+    parts = urlsplit(url)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + BROWSER_WAIT_SECONDS
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        break
+    await asyncio.to_thread(open_browser, url)
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """GZip middleware that passes already-compressed downloads through.
+
+    Starlette before 0.47 only excludes text/event-stream from compression,
+    so PNG illustrations and ZIP exports would otherwise be gzipped again
+    for no size gain.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] == "http" and (path.endswith(UNCOMPRESSED_PATH_SUFFIXES) or "/images/" in path):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files with a short browser cache lifetime.
+
+    StaticFiles already serves through FileResponse (threaded reads, ETag
+    and 304 handling); the max-age lets browsers skip the revalidation
+    round trip entirely for assets on every page load.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.setdefault("Cache-Control", "public, max-age=3600")
+        return response
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle."""
+    await asyncio.to_thread(prewarm)
     logger.info("Blog Creator web server started")
+    browser_url = os.environ.pop(BROWSER_URL_ENV, None)
+    browser_task = asyncio.create_task(open_browser_when_listening(browser_url)) if browser_url else None
     yield
     logger.info("Blog Creator web server shutting down")
+    if browser_task is not None:
+        browser_task.cancel()
+    await content.flush_draft_saves()
 
 
 app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(SessionMiddleware, secret_key="blog-creator-session-key", max_age=1800)
+# Previews, drafts and review JSON are large text bodies; SSE streams are
+# left uncompressed by GZipMiddleware itself, images and ZIPs by the subclass
+app.add_middleware(TextGZipMiddleware, minimum_size=1024, compresslevel=5)
 
 static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(static_dir), follow_symlink=False), name="static")
 
 # Include routers
 app.include_router(configuration.router)
@@ -1,59 +1,50 @@
 """Web mode entry point."""
 
+import importlib.util
 import logging
-import threading
-import time
-import webbrowser
+import os
 
+import click
 import uvicorn
 
+from .app import BROWSER_URL_ENV
+
 logger = logging.getLogger(__name__)
 
 
-def open_browser_delayed(url: str, delay: float = 1.5):
-    """Open browser after server starts."""
-    time.sleep(delay)
-    try:
-        webbrowser.open(url)
-        logger.info(f"Opened browser to {url}")
-    except Exception as e:
-        logger.warning(f"Could not auto-open browser: {e}")
-        print(f"\n🌐 Open your browser to: {url}\n")
+def select_server_impl() -> tuple[str, str]:
+    """Pick uvloop/httptools when installed, else uvicorn's pure-Python defaults."""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
 
 
-def main():
+@click.command()
+@click.option("--host", type=str, default="localhost", help="Host to bind (default: localhost)")
+@click.option("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+@click.option("--no-browser", is_flag=True, help="Don't open a browser on startup")
+@click.option("--mode", type=str, default=None, hidden=True, help="Consumed by the top-level dispatcher")
+def main(host: str, port: int, no_browser: bool, mode: str | None):
     """Start blog creator web interface."""
-    import sys
-
-    no_browser = "--no-browser" in sys.argv
-
-    port = 8000
-    if "--port" in sys.argv:
-        try:
-            port_idx = sys.argv.index("--port")
-            if port_idx + 1 < len(sys.argv):
-                port = int(sys.argv[port_idx + 1])
-        except (ValueError, IndexError):
-            pass
-
-    host = "localhost"
-    if "--host" in sys.argv:
-        try:
-            host_idx = sys.argv.index("--host")
-            if host_idx + 1 < len(sys.argv):
-                host = sys.argv[host_idx + 1]
-        except IndexError:
-            pass
-
     url = f"http://{host}:{port}"
 
     if not no_browser:
-        thread = threading.Thread(target=open_browser_delayed, args=(url,), daemon=True)
-        thread.start()
+        # Opened from the app lifespan once the server accepts connections
+        os.environ[BROWSER_URL_ENV] = url
     else:
         print(f"\n🌐 Server starting at: {url}\n")
 
-    uvicorn.run("amplifier_app_blog_creator.web.app:app", host=host, port=port, log_level="info")
+    loop, http = select_server_impl()
+    logger.info(f"Using {loop} event loop with {http} HTTP parser")
+
+    uvicorn.run(
+        "amplifier_app_blog_creator.web.app:app",
+        host=host,
+        port=port,
+        log_level="info",
+        loop=loop,
+        http=http,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""Markdown preview rendering shared by the editor routes.
+
+One preconfigured Markdown converter and sanitizer serve every preview,
+with results cached by content digest.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import markdown
+import nh3
+
+# Markdown converter for previews, built once; reset() before each convert.
+# No codehilite: the sanitizer strips its Pygments <span>s anyway, and the
+# review page highlights the plain <code class="language-..."> client-side.
+_preview_markdown = markdown.Markdown(
+    extensions=[
+        "extra",
+        "sane_lists",
+    ],
+)
+
+# Sanitizer for preview HTML, built once. Same tags and URL schemes bleach
+# used; link_rel=None keeps nh3 from adding rel attributes to links. img
+# style is limited to sizing properties, so preview content can't position
+# itself over the page.
+_preview_cleaner = nh3.Cleaner(
+    tags={
+        "p",
+        "br",
+        "strong",
+        "em",
+        "u",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "ul",
+        "ol",
+        "li",
+        "a",
+        "code",
+        "pre",
+        "blockquote",
+        "hr",
+        "table",
+        "thead",
+        "tbody",
+        "tr",
+        "th",
+        "td",
+        "img",
+    },
+    attributes={
+        "a": {"href", "title"},
+        "code": {"class"},
+        "img": {"src", "alt", "title", "style"},
+    },
+    url_schemes={"http", "https", "mailto"},
+    link_rel=None,
+    filter_style_properties={"width", "height", "display", "margin"},
+)
+
+
+_preview_lock = threading.Lock()
+
+# Relative "images/..." src on an <img> tag, wherever src appears among the
+# attributes (python-markdown emits alt before src)
+_IMAGE_SRC_RE = re.compile(r'(<img\b[^>]*?\bsrc=")images/')
+
+# Rendered previews by content digest; keyed by digest rather than the
+# draft text so cached entries don't pin full copies of every draft
+MAX_CACHED_PREVIEWS = 256
+_preview_cache: OrderedDict[bytes, str] = OrderedDict()
+
+
+def render_preview(content: str, session_id: str) -> str:
+    """Render markdown to sanitized HTML, reusing the cached result.
+
+    The editor re-sends the same content on every preview refresh, and
+    rendering is a pure function of content and session.
+    """
+    key = hashlib.blake2b(
+        content.encode("utf-8"), digest_size=16, key=session_id.encode("utf-8")[:64]
+    ).digest()
+    with _preview_lock:
+        cached = _preview_cache.get(key)
+        if cached is not None:
+            _preview_cache.move_to_end(key)
+            return cached
+
+    html = _render_uncached(content, session_id)
+
+    with _preview_lock:
+        _preview_cache[key] = html
+        while len(_preview_cache) > MAX_CACHED_PREVIEWS:
+            _preview_cache.popitem(last=False)
+    return html
+
+
+def _render_uncached(content: str, session_id: str) -> str:
+    """Render markdown to sanitized HTML."""
+    # The shared Markdown instance isn't thread-safe
+    with _preview_lock:
+        html = _preview_markdown.reset().convert(content)
+
+    # Rewrite image paths to point to session endpoint
+    html = _IMAGE_SRC_RE.sub(rf"\1/sessions/{session_id}/images/", html)
+
+    # Sanitize HTML to prevent XSS
+    return _preview_cleaner.clean(html)
@@ -1,12 +1,16 @@
 """Execute Amplifier recipes via CLI subprocess and stream progress to SSE queue."""
 
 import asyncio
-import json
+import functools
 import logging
+import os
+import re
 import shutil
 from pathlib import Path
 from typing import Any
 
+from ..json_codec import dumps
+
 try:
     import yaml
 except ImportError:
@@ -14,6 +18,65 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Bytes per subprocess pipe read and StreamReader buffer limit
+READ_CHUNK_SIZE = 64 * 1024
+STREAM_LIMIT = 4 * 1024 * 1024
+
+# Linux rejects any single argv string longer than this (MAX_ARG_STRLEN)
+MAX_ARG_BYTES = 128 * 1024
+
+# Max progress messages enqueued per put_many call
+MAX_QUEUE_BATCH = 32
+
+# Stage name following a "stage:" marker in CLI output
+_STAGE_MARKER_RE = re.compile(r"stage:\s*(?P<name>\S+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_recipe_stage_names(recipe_path: str, mtime_ns: int) -> tuple[str, ...]:
+    """Parse stage names from a recipe YAML file.
+    
+    Cached per (path, mtime) so each session start in a running server
+    skips the YAML parse until the recipe file changes.
+    """
+    with open(recipe_path) as f:
+        recipe_data = yaml.safe_load(f)
+    return tuple(stage.get("name", "") for stage in recipe_data.get("stages", []))
+
+
+@functools.lru_cache(maxsize=1)
+def _find_amplifier_cli() -> str:
+    """Find amplifier CLI executable path.
+    
+    Resolved once per process; a failed lookup is not cached, so
+    installing the CLI later is picked up on the next attempt.
+    
+    Returns:
+        Path to amplifier executable
+        
+    Raises:
+        RuntimeError: If amplifier CLI not found
+    """
+    # Try which command first
+    amplifier = shutil.which("amplifier")
+    if amplifier:
+        return amplifier
+    
+    # Fallback to common locations
+    common_paths = [
+        Path.home() / ".local" / "bin" / "amplifier",
+        Path("/usr/local/bin/amplifier"),
+        Path("/usr/bin/amplifier"),
+    ]
+    
+    for path in common_paths:
+        if path.exists():
+            return str(path)
+    
+    raise RuntimeError(
+        "Amplifier CLI not found. Ensure 'amplifier' is installed and in PATH."
+    )
+
 
 class RecipeExecutor:
     """Execute Amplifier recipes via CLI and stream progress to SSE queue.
@@ -39,36 +102,19 @@ class RecipeExecutor:
         """
         self.recipe_path = Path(recipe_path)
         self.stage_map = self._load_stage_map()
-        self.amplifier_path = self._find_amplifier_cli()
+        self._compile_stage_prefix()
+        self.amplifier_path = _find_amplifier_cli()
     
-    def _find_amplifier_cli(self) -> str:
-        """Find amplifier CLI executable path.
-        
-        Returns:
-            Path to amplifier executable
-            
-        Raises:
-            RuntimeError: If amplifier CLI not found
-        """
-        # Try which command first
-        amplifier = shutil.which("amplifier")
-        if amplifier:
-            return amplifier
-        
-        # Fallback to common locations
-        common_paths = [
-            Path.home() / ".local" / "bin" / "amplifier",
-            Path("/usr/local/bin/amplifier"),
-            Path("/usr/bin/amplifier"),
-        ]
-        
-        for path in common_paths:
-            if path.exists():
-                return str(path)
-        
-        raise RuntimeError(
-            "Amplifier CLI not found. Ensure 'amplifier' is installed and in PATH."
+    def _compile_stage_prefix(self) -> None:
+        """Precompile the line-prefix matcher for known stage names."""
+        # Longest names first so a stage whose name prefixes another can't shadow it
+        names = sorted(self.stage_map, key=len, reverse=True)
+        self._stage_prefix_re = (
+            re.compile("|".join(map(re.escape, names)), re.IGNORECASE) if names else None
         )
+        self._stage_names_by_lower = {name.lower(): name for name in self.stage_map}
+        # First characters of stage names, to skip the prefix regex for most lines
+        self._stage_first_chars = frozenset(name[:1].lower() for name in self.stage_map if name)
     
     def _load_stage_map(self) -> dict[str, tuple[str, int]]:
         """Load recipe stages and build stage mapping.
@@ -79,29 +125,28 @@ class RecipeExecutor:
         Returns:
             Dictionary mapping stage names to (display_name, index) tuples
         """
-        if not self.recipe_path.exists():
+        try:
+            mtime_ns = self.recipe_path.stat().st_mtime_ns
+        except OSError:
             logger.warning(f"Recipe file not found: {self.recipe_path}")
             return self.STAGE_MAPPING
         
         # Try to parse with PyYAML if available
         if yaml:
             try:
-                with open(self.recipe_path) as f:
-                    recipe_data = yaml.safe_load(f)
-                    stages = recipe_data.get("stages", [])
-                    
-                    # Build map from recipe stage names
-                    stage_map = {}
-                    for idx, stage in enumerate(stages):
-                        stage_name = stage.get("name", "")
-                        if stage_name in self.STAGE_MAPPING:
-                            stage_map[stage_name] = self.STAGE_MAPPING[stage_name]
-                        else:
-                            # Unknown stage - use name as display and assign index
-                            logger.warning(f"Unknown stage in recipe: {stage_name}")
-                            stage_map[stage_name] = (stage_name.title(), idx)
-                    
-                    return stage_map if stage_map else self.STAGE_MAPPING
+                stage_names = _load_recipe_stage_names(str(self.recipe_path), mtime_ns)
+                
+                # Build map from recipe stage names
+                stage_map = {}
+                for idx, stage_name in enumerate(stage_names):
+                    if stage_name in self.STAGE_MAPPING:
+                        stage_map[stage_name] = self.STAGE_MAPPING[stage_name]
+                    else:
+                        # Unknown stage - use name as display and assign index
+                        logger.warning(f"Unknown stage in recipe: {stage_name}")
+                        stage_map[stage_name] = (stage_name.title(), idx)
+                
+                return stage_map if stage_map else self.STAGE_MAPPING
                     
             except Exception as e:
                 logger.warning(f"Failed to parse recipe YAML: {e}")
@@ -121,9 +166,20 @@ class RecipeExecutor:
             
         Returns:
             Command array for subprocess execution
+            
+        Raises:
+            ValueError: If the serialized context is too large to pass on argv
         """
-        # Serialize context to JSON
-        context_json = json.dumps(context)
+        # Serialize context to JSON (compact; it travels on argv)
+        context_json = dumps(context).decode("utf-8")
+        
+        # Fail with a clear message instead of an opaque E2BIG from exec
+        context_arg = f"context={context_json}"
+        if len(context_arg.encode("utf-8")) >= MAX_ARG_BYTES:
+            raise ValueError(
+                f"Recipe context is too large to pass to amplifier "
+                f"({len(context_arg)} characters, limit {MAX_ARG_BYTES} bytes)"
+            )
         
         # Build command
         cmd = [
@@ -133,10 +189,11 @@ class RecipeExecutor:
             "recipes",
             "operation=execute",
             f"recipe_path={self.recipe_path}",
-            f"context={context_json}",
+            context_arg,
         ]
         
-        logger.debug(f"Built command: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Built command: {' '.join(cmd)}")
         return cmd
     
     def _detect_stage(self, line: str) -> tuple[str, int] | None:
@@ -150,41 +207,35 @@ class RecipeExecutor:
         Returns:
             (stage_name, stage_index) tuple if stage detected, None otherwise
         """
-        line_lower = line.lower()
-        
         # Common patterns in recipe execution output
-        # Look for: "Starting stage: <name>", "Running stage <name>", etc.
-        stage_indicators = [
-            "starting stage:",
-            "running stage:",
-            "stage:",
-            "executing stage:",
-        ]
-        
-        for indicator in stage_indicators:
-            if indicator in line_lower:
-                # Extract stage name after indicator
-                idx = line_lower.index(indicator) + len(indicator)
-                stage_name = line[idx:].strip().split()[0].strip("'\":")
-                
-                # Look up in our mapping
-                if stage_name in self.stage_map:
-                    display_name, stage_idx = self.stage_map[stage_name]
-                    logger.debug(f"Detected stage: {stage_name} -> {display_name} (index {stage_idx})")
-                    return (stage_name, stage_idx)
-        
-        # Also check if line starts with stage name
-        for stage_name in self.stage_map:
-            if line_lower.startswith(stage_name):
+        # ("Starting stage: <name>", "Running stage: <name>", etc.) all
+        # share the "stage:" marker. Most lines have no colon at all, so a
+        # plain containment check skips the regex scan for them.
+        match = _STAGE_MARKER_RE.search(line) if ":" in line else None
+        if match:
+            stage_name = match.group("name").strip("'\":")
+            
+            # Look up in our mapping
+            if stage_name in self.stage_map:
                 display_name, stage_idx = self.stage_map[stage_name]
+                logger.debug(f"Detected stage: {stage_name} -> {display_name} (index {stage_idx})")
                 return (stage_name, stage_idx)
         
+        # Also check if line starts with stage name
+        match = None
+        if self._stage_prefix_re and line[:1].lower() in self._stage_first_chars:
+            match = self._stage_prefix_re.match(line)
+        if match:
+            stage_name = self._stage_names_by_lower[match.group(0).lower()]
+            display_name, stage_idx = self.stage_map[stage_name]
+            return (stage_name, stage_idx)
+        
         return None
     
     async def _stream_output(self, proc: asyncio.subprocess.Process, queue) -> bool:
         """Stream subprocess output to message queue.
         
-        Reads stdout/stderr line-by-line, detects stage transitions,
+        Reads the combined stdout/stderr pipe in chunks, detects stage transitions per line,
         and puts progress updates in the queue.
         
         Args:
@@ -196,58 +247,89 @@ class RecipeExecutor:
         """
         current_stage = None
         current_stage_idx = -1
+        # Checked once per run rather than formatting every line
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        async def read_stream(stream, stream_name):
-            """Read from a stream line by line."""
+        def parse_line(line_bytes: bytes, stream_name: str) -> tuple[str, str | None, int | None, bool] | None:
+            """Turn one output line into a queue message, tracking stage transitions.
+            
+            Returns:
+                (message, stage, stage_index, is_transition) or None for blank lines
+            """
             nonlocal current_stage, current_stage_idx
             
+            line = line_bytes.decode('utf-8', errors='replace').rstrip()
+            if not line:
+                return None
+            
+            # Log all output at DEBUG level
+            if debug_enabled:
+                logger.debug(f"[{stream_name}] {line}")
+            
+            # Detect stage transitions
+            stage_info = self._detect_stage(line)
+            if stage_info:
+                stage_name, stage_idx = stage_info
+                current_stage = stage_name
+                current_stage_idx = stage_idx
+                
+                # Get display name
+                display_name, _ = self.stage_map.get(stage_name, (stage_name, stage_idx))
+                
+                # Stage transition message
+                return (f"Starting: {display_name}", stage_name, stage_idx, True)
+            
+            # Regular progress message with current stage context
+            return (line, current_stage, current_stage_idx if current_stage_idx >= 0 else None, False)
+        
+        async def read_stream(stream, stream_name):
+            """Read from a stream in chunks and split into lines.
+            
+            One read() per chunk instead of one readline() per line keeps
+            event-loop wakeups proportional to output volume, not line count.
+            """
+            buffer = bytearray()
+            
             while True:
                 try:
-                    line_bytes = await stream.readline()
-                    if not line_bytes:
-                        break
-                    
-                    line = line_bytes.decode('utf-8', errors='replace').rstrip()
-                    if not line:
-                        continue
+                    chunk = await stream.read(READ_CHUNK_SIZE)
+                    if chunk:
+                        buffer += chunk
+                        end = buffer.rfind(b"\n")
+                        if end < 0:
+                            continue
+                        # Complete lines only; keep the trailing partial line buffered
+                        lines = bytes(buffer[:end]).split(b"\n")
+                        del buffer[:end + 1]
+                    else:
+                        # EOF - flush any final unterminated line
+                        lines = [bytes(buffer)] if buffer else []
+                        buffer.clear()
                     
-                    # Log all output at DEBUG level
-                    logger.debug(f"[{stream_name}] {line}")
+                    # Enqueue in batches; stage transitions flush right away
+                    batch = []
+                    for line_bytes in lines:
+                        parsed = parse_line(line_bytes, stream_name)
+                        if parsed is None:
+                            continue
+                        message, stage, stage_index, is_transition = parsed
+                        batch.append((message, stage, stage_index))
+                        if is_transition or len(batch) >= MAX_QUEUE_BATCH:
+                            await queue.put_many(batch)
+                            batch = []
+                    if batch:
+                        await queue.put_many(batch)
                     
-                    # Detect stage transitions
-                    stage_info = self._detect_stage(line)
-                    if stage_info:
-                        stage_name, stage_idx = stage_info
-                        current_stage = stage_name
-                        current_stage_idx = stage_idx
-                        
-                        # Get display name
-                        display_name, _ = self.stage_map.get(stage_name, (stage_name, stage_idx))
-                        
-                        # Send stage transition message
-                        await queue.put(
-                            f"Starting: {display_name}",
-                            stage=stage_name,
-                            stage_index=stage_idx
-                        )
-                    else:
-                        # Send regular progress message with current stage context
-                        await queue.put(
-                            line,
-                            stage=current_stage,
-                            stage_index=current_stage_idx if current_stage_idx >= 0 else None
-                        )
+                    if not chunk:
+                        break
                 
                 except Exception as e:
                     logger.error(f"Error reading {stream_name}: {e}")
                     break
         
-        # Read both stdout and stderr concurrently
+        # stderr is redirected onto stdout in execute(), so one reader drains both
         try:
-            await asyncio.gather(
-                read_stream(proc.stdout, "stdout"),
-                read_stream(proc.stderr, "stderr"),
-            )
+            await read_stream(proc.stdout, "output")
         except Exception as e:
             logger.error(f"Error streaming output: {e}")
             await queue.put(f"Error streaming output: {str(e)}")
@@ -263,11 +345,23 @@ class RecipeExecutor:
         
         return True
     
+    async def _terminate(self, proc: asyncio.subprocess.Process) -> None:
+        """Terminate subprocess, killing it if it doesn't exit within 5 seconds."""
+        if proc.returncode is not None:
+            return
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+    
     async def execute(
         self,
         context: dict[str, Any],
         session_dir: Path,
         queue,
+        env: dict[str, str] | None = None,
     ) -> bool:
         """Execute recipe with context and stream progress.
         
@@ -278,6 +372,8 @@ class RecipeExecutor:
             context: Recipe context variables (topic, style_samples_dir, etc.)
             session_dir: Output directory for recipe artifacts
             queue: MessageQueue for progress updates
+            env: Extra environment variables for the recipe subprocess only
+                (e.g. ANTHROPIC_API_KEY), layered over os.environ
             
         Returns:
             True if execution successful, False on error
@@ -305,8 +401,12 @@ class RecipeExecutor:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
                 cwd=str(session_dir),
+                limit=STREAM_LIMIT,
+                # amplifier is a Python CLI: flush output as it's produced
+                # rather than in block-buffered bursts, always as UTF-8
+                env={**os.environ, **(env or {}), "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
             )
             
             # Stream output with timeout
@@ -329,14 +429,15 @@ class RecipeExecutor:
                 await queue.put("Error: Recipe execution timed out (30 minute limit)")
                 
                 # Terminate the process
-                proc.terminate()
-                try:
-                    await asyncio.wait_for(proc.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    await proc.wait()
+                await self._terminate(proc)
                 
                 return False
+            
+            except asyncio.CancelledError:
+                # Don't leave the amplifier process running unattended
+                logger.info("Recipe execution cancelled, terminating subprocess")
+                await self._terminate(proc)
+                raise
         
         except Exception as e:
             logger.error(f"Recipe execution error: {e}", exc_info=True)
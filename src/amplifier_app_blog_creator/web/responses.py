@@ -0,0 +1,52 @@
+"""Response classes and SSE frame encoding shared by web routes."""
+
+from typing import Any
+
+from fastapi.responses import HTMLResponse
+from fastapi.responses import JSONResponse as _JSONResponse
+from sse_starlette import ServerSentEvent
+
+from ..json_codec import dumps
+
+
+def encode_sse_event(event: str, data: Any) -> bytes:
+    """Encode an SSE event with JSON data straight to wire bytes.
+
+    Serialized JSON never contains a raw line break, so the data is always
+    one "data:" line and ServerSentEvent's line splitting (and, with
+    orjson, a bytes -> str -> bytes round trip) can be skipped.
+    """
+    return b"event: " + event.encode("utf-8") + b"\r\ndata: " + dumps(data) + b"\r\n\r\n"
+
+
+# Keepalive event, encoded once; EventSourceResponse sends bytes as-is
+SSE_PING = ServerSentEvent(event="ping", data="").encode()
+
+
+_HTML_CONTENT_TYPE = (b"content-type", b"text/html; charset=utf-8")
+
+
+class StaticHTMLResponse(HTMLResponse):
+    """HTMLResponse for a fragment encoded to bytes once, at import time.
+
+    Skips render() and header derivation. Still construct one per request:
+    middleware such as SessionMiddleware appends Set-Cookie to a response's
+    header list, so a shared instance would leak headers between clients.
+    """
+
+    def __init__(self, body: bytes, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.background = None
+        self.raw_headers = [(b"content-length", str(len(body)).encode("latin-1")), _HTML_CONTENT_TYPE]
+
+
+class JSONResponse(_JSONResponse):
+    """JSONResponse that serializes with orjson when it is installed.
+
+    orjson encodes straight to bytes; without it this is compact stdlib
+    json, as in the standard JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,8 +1,12 @@
 """Configuration routes for API key setup."""
 
+import asyncio
+import hashlib
+import html
 import logging
 import os
-from pathlib import Path
+import time
+from collections import OrderedDict
 from typing import Annotated
 
 import anthropic
@@ -11,14 +15,101 @@ from fastapi import Form
 from fastapi import Request
 from fastapi.responses import HTMLResponse
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+
+from ..templates_config import templates
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-template_dir = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(template_dir))
+# Static feedback fragments, encoded once at import
+_EMPTY_KEY_HTML = b"""
+            <div id="config-feedback" class="feedback feedback-error">
+                Please enter an API key
+            </div>
+        """
+
+_BAD_FORMAT_HTML = b"""
+            <div id="config-feedback" class="feedback feedback-error">
+                Invalid API key format. Keys should start with 'sk-ant-'
+            </div>
+        """
+
+_SUCCESS_HTML = b"""
+            <div id="config-feedback" class="feedback feedback-success">
+                <p>API key validated successfully!</p>
+                <p>Redirecting to workflow...</p>
+                <script>
+                    setTimeout(() => {
+                        window.location.href = '/sessions/new';
+                    }, 1000);
+                </script>
+            </div>
+        """
+
+_INVALID_KEY_HTML = b"""
+            <div id="config-feedback" class="feedback feedback-error">
+                Invalid API key. Please check your key and try again.
+            </div>
+        """
+
+_UNEXPECTED_ERROR_HTML = b"""
+            <div id="config-feedback" class="feedback feedback-error">
+                Unexpected error. Please try again.
+            </div>
+        """
+
+# Re-submitting a key validated within this window skips the API round trip
+VALIDATION_TTL_SECONDS = 3600
+
+# Most recently validated keys remembered
+MAX_VALIDATED_KEYS = 64
+
+# Key hash -> monotonic time of last successful validation, least recent first
+_validated_keys: OrderedDict[str, float] = OrderedDict()
+
+# Most recently used Anthropic clients kept, by key hash
+MAX_CACHED_CLIENTS = 8
+
+_clients: OrderedDict[str, anthropic.Anthropic] = OrderedDict()
+
+
+def _hash_key(api_key: str) -> str:
+    """Hash an API key so validated keys aren't held in plain text."""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
+
+def _recently_validated(key_hash: str) -> bool:
+    """Check whether a key was validated within the TTL, forgetting it once expired."""
+    validated_at = _validated_keys.get(key_hash)
+    if validated_at is None:
+        return False
+    if time.monotonic() - validated_at > VALIDATION_TTL_SECONDS:
+        del _validated_keys[key_hash]
+        return False
+    return True
+
+
+def _remember_validated(key_hash: str):
+    """Record a successful validation, evicting the least recent beyond the cap."""
+    _validated_keys[key_hash] = time.monotonic()
+    _validated_keys.move_to_end(key_hash)
+    while len(_validated_keys) > MAX_VALIDATED_KEYS:
+        _validated_keys.popitem(last=False)
+
+
+def _client_for_key(key_hash: str, api_key: str) -> anthropic.Anthropic:
+    """Reuse one client (and its connection pool) per API key.
+
+    Cached by the key's hash; the key itself is held only by its client.
+    """
+    client = _clients.get(key_hash)
+    if client is None:
+        client = _clients[key_hash] = anthropic.Anthropic(api_key=api_key)
+    _clients.move_to_end(key_hash)
+    while len(_clients) > MAX_CACHED_CLIENTS:
+        _clients.popitem(last=False)
+    return client
 
 
 def get_api_key(request: Request) -> str | None:
@@ -57,58 +148,39 @@ async def validate_api_key(request: Request, api_key: Annotated[str, Form()]):
     api_key = api_key.strip()
 
     if not api_key:
-        return """
-            <div id="config-feedback" class="feedback feedback-error">
-                Please enter an API key
-            </div>
-        """
+        return HTMLResponse(_EMPTY_KEY_HTML)
 
     if not api_key.startswith("sk-ant-"):
-        return """
-            <div id="config-feedback" class="feedback feedback-error">
-                Invalid API key format. Keys should start with 'sk-ant-'
-            </div>
-        """
+        return HTMLResponse(_BAD_FORMAT_HTML)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        client.messages.create(
-            model="claude-3-5-sonnet-20241022", max_tokens=10, messages=[{"role": "user", "content": "test"}]
-        )
+        key_hash = _hash_key(api_key)
+        if not _recently_validated(key_hash):
+            client = _client_for_key(key_hash, api_key)
+            # The sync client blocks for the whole round trip; keep it off the event loop
+            await asyncio.to_thread(
+                client.messages.create,
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=10,
+                messages=[{"role": "user", "content": "test"}],
+            )
+            _remember_validated(key_hash)
 
         request.session["ANTHROPIC_API_KEY"] = api_key
         logger.info("API key validated and stored in session")
 
-        return """
-            <div id="config-feedback" class="feedback feedback-success">
-                <p>API key validated successfully!</p>
-                <p>Redirecting to workflow...</p>
-                <script>
-                    setTimeout(() => {
-                        window.location.href = '/sessions/new';
-                    }, 1000);
-                </script>
-            </div>
-        """
+        return HTMLResponse(_SUCCESS_HTML)
 
     except anthropic.AuthenticationError:
         logger.warning("Invalid API key attempted")
-        return """
-            <div id="config-feedback" class="feedback feedback-error">
-                Invalid API key. Please check your key and try again.
-            </div>
-        """
+        return HTMLResponse(_INVALID_KEY_HTML)
     except anthropic.APIError as e:
         logger.error(f"Anthropic API error during validation: {e}")
-        return f"""
+        return HTMLResponse(f"""
             <div id="config-feedback" class="feedback feedback-error">
-                API error: {str(e)}. Please try again.
+                API error: {html.escape(str(e))}. Please try again.
             </div>
-        """
+        """)
     except Exception as e:
         logger.error(f"Unexpected error during API key validation: {e}")
-        return """
-            <div id="config-feedback" class="feedback feedback-error">
-                Unexpected error. Please try again.
-            </div>
-        """
+        return HTMLResponse(_UNEXPECTED_ERROR_HTML)
@@ -1,123 +1,193 @@
 """Content and markdown editing routes."""
 
+import asyncio
 import logging
+import platform
+import subprocess
+import zipfile
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Annotated
 
-import bleach
-import markdown
+from amplifier_module_markdown_utils import extract_title
+from amplifier_module_markdown_utils import slugify
 from fastapi import APIRouter
 from fastapi import Body
 from fastapi import Form
 from fastapi import Request
+from fastapi.responses import FileResponse
 from fastapi.responses import HTMLResponse
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
 from ...session import SessionManager
+from ..markdown_preview import render_preview
+from ..responses import JSONResponse
+from ..session_cache import get_session_manager
+from ..session_images import list_session_images
 from ..templates_config import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions")
 
+# Bytes read from each image per streamed ZIP chunk
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Largest draft rendered by the live preview
+MAX_PREVIEW_CHARS = 512_000
+
+# Quiet period after the last autosave before the draft is written to disk
+DRAFT_SAVE_DELAY = 0.5
+
+# Debounced draft saves not yet started, by session_id
+_pending_draft_saves: dict[str, tuple[asyncio.TimerHandle, SessionManager]] = {}
+# Latest started save per session_id; saves run in order under the lock,
+# so once it is done every earlier save for the session is too
+_draft_save_tasks: dict[str, asyncio.Task] = {}
+_draft_save_lock = asyncio.Lock()
+
+
+async def _save_draft(session_mgr: SessionManager) -> None:
+    """Write the session's in-memory draft to disk."""
+    # One save at a time, so an older draft never lands after a newer one
+    async with _draft_save_lock:
+        try:
+            await asyncio.to_thread(session_mgr.update_draft, session_mgr.state.current_draft or "")
+        except Exception as e:
+            logger.error(f"Failed to save draft for {session_mgr.session_dir}: {e}", exc_info=True)
+
+
+def _schedule_draft_save(session_id: str, session_mgr: SessionManager) -> None:
+    """(Re)start the debounce timer for a session's draft save."""
+    pending = _pending_draft_saves.pop(session_id, None)
+    if pending is not None:
+        pending[0].cancel()
+
+    def start_save():
+        _pending_draft_saves.pop(session_id, None)
+        task = _draft_save_tasks[session_id] = asyncio.create_task(_save_draft(session_mgr))
+
+        def forget(done: asyncio.Task):
+            if _draft_save_tasks.get(session_id) is done:
+                del _draft_save_tasks[session_id]
+
+        task.add_done_callback(forget)
+
+    handle = asyncio.get_running_loop().call_later(DRAFT_SAVE_DELAY, start_save)
+    _pending_draft_saves[session_id] = (handle, session_mgr)
+
+
+async def flush_draft_save(session_id: str) -> None:
+    """Write a session's pending debounced draft save now and wait for in-flight ones."""
+    pending = _pending_draft_saves.pop(session_id, None)
+    if pending is not None:
+        pending[0].cancel()
+        await _save_draft(pending[1])
+    task = _draft_save_tasks.get(session_id)
+    if task is not None:
+        await task
+
+
+async def flush_draft_saves() -> None:
+    """Write all pending draft saves and wait for in-flight ones (shutdown)."""
+    for session_id in list(_pending_draft_saves):
+        await flush_draft_save(session_id)
+    if _draft_save_tasks:
+        await asyncio.gather(*_draft_save_tasks.values())
+
+
+def _slug_for_draft(draft: str) -> str:
+    """Derive the final filename slug from the draft's title."""
+    title = extract_title(draft)
+    return slugify(title) if title else "blog-post"
+
+
+# Review pages rendered as their workflow completes, so the redirect that
+# follows is served without a render. Each is used once, and only while
+# state.json is unchanged since (state_mtime_ns, html).
+MAX_PRERENDERED_REVIEWS = 16
+_prerendered_reviews: dict[str, tuple[int | None, str]] = {}
+
+# review.html uses nothing from the request, so it is rendered directly
+_review_template = templates.get_template("review.html")
+
+
+def _render_review(session_id: str, session_mgr: SessionManager) -> str:
+    """Render the review/editor page for a session."""
+    return _review_template.render(
+        session_id=session_id,
+        draft=session_mgr.state.current_draft or "",
+        iteration=session_mgr.state.iteration,
+    )
+
+
+async def prerender_review(session_id: str, session_mgr: SessionManager) -> None:
+    """Render a just-completed session's review page ahead of its first request."""
+    state_mtime_ns = session_mgr.state_mtime_ns
+    html = await asyncio.to_thread(_render_review, session_id, session_mgr)
+    _prerendered_reviews[session_id] = (state_mtime_ns, html)
+    while len(_prerendered_reviews) > MAX_PRERENDERED_REVIEWS:
+        del _prerendered_reviews[next(iter(_prerendered_reviews))]
+
+
+def _final_slug(session_mgr: SessionManager) -> str:
+    """Slug of the approved draft, falling back to the current draft's title."""
+    return session_mgr.state.final_slug or _slug_for_draft(session_mgr.state.current_draft or "")
+
 
 @router.get("/{session_id}/review", response_class=HTMLResponse)
 async def review_page(request: Request, session_id: str):
     """Show review/editor page."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
 
-    return templates.TemplateResponse(
-        "review.html",
-        {
-            "request": request,
-            "session_id": session_id,
-            "draft": session_mgr.state.current_draft or "",
-            "iteration": session_mgr.state.iteration,
-        },
-    )
+    prerendered = _prerendered_reviews.pop(session_id, None)
+    if prerendered is not None and prerendered[0] == session_mgr.state_mtime_ns:
+        return HTMLResponse(prerendered[1])
+
+    return HTMLResponse(_render_review(session_id, session_mgr))
 
 
 @router.get("/{session_id}/draft")
 async def get_draft(session_id: str):
     """Get current draft content."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
     return JSONResponse({"content": session_mgr.state.current_draft or ""})
 
 
 @router.put("/{session_id}/draft")
 async def update_draft(session_id: str, content: Annotated[str, Body(embed=True)]):
-    """Update draft content (auto-save)."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
-    session_mgr.update_draft(content)
+    """Update draft content (auto-save).
+
+    The cached session sees the new content immediately; the disk write
+    is debounced so a burst of autosaves results in a single save.
+    """
+    session_mgr = get_session_manager(session_id)
+    session_mgr.state.current_draft = content
+    _prerendered_reviews.pop(session_id, None)
+    _schedule_draft_save(session_id, session_mgr)
     return JSONResponse({"saved": True})
 
 
 @router.post("/{session_id}/render-markdown")
 async def render_markdown(session_id: str, content: Annotated[str, Form()]):
     """Render markdown to HTML for preview with image support."""
-    html = markdown.markdown(
-        content,
-        extensions=[
-            "extra",
-            "codehilite",
-            "sane_lists",
-        ],
-    )
-
-    # Rewrite image paths to point to session endpoint
-    import re
-
-    html = re.sub(
-        r'<img src="images/([^"]+)"',
-        rf'<img src="/sessions/{session_id}/images/\1"',
-        html,
-    )
-
-    # Sanitize HTML to prevent XSS
-    safe_html = bleach.clean(
-        html,
-        tags=[
-            "p",
-            "br",
-            "strong",
-            "em",
-            "u",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-            "ul",
-            "ol",
-            "li",
-            "a",
-            "code",
-            "pre",
-            "blockquote",
-            "hr",
-            "table",
-            "thead",
-            "tbody",
-            "tr",
-            "th",
-            "td",
-            "img",
-        ],
-        attributes={
-            "a": ["href", "title"],
-            "code": ["class"],
-            "img": ["src", "alt", "title", "style"],
-        },
-        strip=True,
-    )
-
+    # Markdown parsing can be superlinear; don't let one huge paste pin a worker
+    if len(content) > MAX_PREVIEW_CHARS:
+        return HTMLResponse(
+            '<div class="markdown-preview"><p>This draft is too large for live preview '
+            f"({len(content):,} characters; the limit is {MAX_PREVIEW_CHARS:,}).</p></div>",
+            status_code=413,
+        )
+
+    # Rendering is CPU-bound; keep the event loop free for SSE streams
+    safe_html = await asyncio.to_thread(render_preview, content, session_id)
     return HTMLResponse(f'<div class="markdown-preview">{safe_html}</div>')
 
 
 @router.get("/{session_id}/review-data")
 async def get_review_data(session_id: str):
     """Get review issues for drawer."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
 
     # Extract issues arrays from review dicts
     source_issues = session_mgr.state.source_review.get("issues", []) if session_mgr.state.source_review else []
@@ -135,21 +205,24 @@ async def get_review_data(session_id: str):
 @router.post("/{session_id}/approve")
 async def approve_draft(session_id: str):
     """Approve and finalize draft."""
-    from amplifier_module_markdown_utils import extract_title
-    from amplifier_module_markdown_utils import slugify
-
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
+    await flush_draft_save(session_id)
 
     # Extract title and create slug like CLI does
     draft = session_mgr.state.current_draft or ""
-    title = extract_title(draft)
-    slug = slugify(title) if title else "blog-post"
+    slug = _slug_for_draft(draft)
 
     # Save final draft with slug-based filename
     output_path = session_mgr.session_dir / f"{slug}.md"
-    output_path.write_text(draft)
+    await asyncio.to_thread(output_path.write_text, draft)
 
-    session_mgr.update_stage("complete")
+    # Remember the final filename so later pages don't re-derive it. Under
+    # the draft save lock, so no autosave's state write can land after it.
+    async with _draft_save_lock:
+        session_mgr.state.final_slug = slug
+        session_mgr.state.final_path = str(output_path)
+        session_mgr.state.final_word_count = len(draft.split())
+        await asyncio.to_thread(session_mgr.update_stage, "complete")
 
     return JSONResponse({"download_path": str(output_path), "redirect": f"/sessions/{session_id}/complete"})
 
@@ -157,32 +230,28 @@ async def approve_draft(session_id: str):
 @router.get("/{session_id}/complete", response_class=HTMLResponse)
 async def complete_page(request: Request, session_id: str):
     """Show completion page with full absolute paths."""
-    from amplifier_module_markdown_utils import extract_title
-    from amplifier_module_markdown_utils import slugify
+    session_mgr = get_session_manager(session_id)
 
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    # Word count recorded at approval, else calculated from the draft
+    word_count = session_mgr.state.final_word_count
+    if word_count is None:
+        word_count = len((session_mgr.state.current_draft or "").split())
 
-    # Calculate word count
-    draft = session_mgr.state.current_draft or ""
-    word_count = len(draft.split())
-
-    # Use same slug logic as approve endpoint
-    title = extract_title(draft)
-    slug = slugify(title) if title else "blog-post"
-    draft_filename = f"{slug}.md"
+    # Use same slug as approve endpoint
+    draft_filename = f"{_final_slug(session_mgr)}.md"
 
     # Get absolute session path
     session_path = session_mgr.session_dir.resolve()
 
     # Check for images
     images_dir = session_mgr.session_dir / "images"
-    has_images = images_dir.exists() and any(images_dir.glob("*.png"))
-    image_files = [img.name for img in sorted(images_dir.glob("*.png"))] if has_images else []
+    image_files = [entry.name for entry in list_session_images(images_dir)]
+    has_images = bool(image_files)
 
     return templates.TemplateResponse(
+        request,
         "complete.html",
         {
-            "request": request,
             "session_id": session_id,
             "iteration": session_mgr.state.iteration,
             "word_count": word_count,
@@ -197,64 +266,98 @@ async def complete_page(request: Request, session_id: str):
 @router.get("/{session_id}/download")
 async def download_draft(session_id: str):
     """Download final draft as markdown file."""
-    from amplifier_module_markdown_utils import extract_title
-    from amplifier_module_markdown_utils import slugify
-    from fastapi.responses import FileResponse
+    session_mgr = get_session_manager(session_id)
 
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    # Use same slug and file as the approve endpoint
+    slug = _final_slug(session_mgr)
+    if session_mgr.state.final_path:
+        output_path = Path(session_mgr.state.final_path)
+    else:
+        output_path = session_mgr.session_dir / f"{slug}.md"
 
-    # Use same slug logic for consistency
-    draft = session_mgr.state.current_draft or ""
-    title = extract_title(draft)
-    slug = slugify(title) if title else "blog-post"
-    output_path = session_mgr.session_dir / f"{slug}.md"
+    headers = {"Content-Disposition": f'attachment; filename="{slug}.md"'}
 
-    if not output_path.exists():
-        output_path.write_text(draft)
+    # One stat serves both the existence check and FileResponse's headers
+    try:
+        stat_result = output_path.stat()
+    except FileNotFoundError:
+        # Not approved yet: serve the current draft from memory. A download
+        # never writes the file; only approve does.
+        return Response(session_mgr.state.current_draft or "", media_type="text/markdown", headers=headers)
 
     return FileResponse(
         path=str(output_path),
+        stat_result=stat_result,
         media_type="text/markdown",
         filename=f"{slug}.md",
-        headers={"Content-Disposition": f'attachment; filename="{slug}.md"'},
+        headers=headers,
     )
 
 
-@router.get("/{session_id}/download-zip")
-async def download_zip(session_id: str):
-    """Download content and images as ZIP file."""
-    import io
-    import zipfile
+class _ZipChunkWriter:
+    """Write-only sink collecting ZIP output until the next chunk is yielded.
 
-    from amplifier_module_markdown_utils import extract_title
-    from amplifier_module_markdown_utils import slugify
-    from fastapi.responses import StreamingResponse
+    Has no tell()/seek(), so zipfile writes in streaming mode (data
+    descriptors after each entry) rather than seeking back to headers.
+    """
 
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    def __init__(self):
+        self._chunks: list[bytes] = []
 
-    # Get slug for filename
-    draft = session_mgr.state.current_draft or ""
-    title = extract_title(draft)
-    slug = slugify(title) if title else "blog-post"
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
-    # Create ZIP in memory
-    zip_buffer = io.BytesIO()
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+def _iter_zip(draft: str, slug: str, images_dir: Path) -> Iterator[bytes]:
+    """Yield a ZIP of the draft and its images as it is built.
+
+    Synchronous on purpose: StreamingResponse iterates it in a worker
+    thread, so compression and file reads stay off the event loop.
+    """
+    sink = _ZipChunkWriter()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
         # Add markdown file
         zip_file.writestr(f"{slug}.md", draft)
+        yield sink.drain()
+
+        # Add images if they exist, to images/ folder in ZIP
+        for entry in list_session_images(images_dir):
+            img_path = Path(entry.path)
+            zip_info = zipfile.ZipInfo.from_file(img_path, f"images/{entry.name}")
+            # PNG data is already deflated; recompressing only costs CPU
+            zip_info.compress_type = zipfile.ZIP_STORED
+            with open(img_path, "rb") as src, zip_file.open(zip_info, "w") as dest:
+                while chunk := src.read(ZIP_CHUNK_SIZE):
+                    dest.write(chunk)
+                    yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
 
-        # Add images if they exist
-        images_dir = session_mgr.session_dir / "images"
-        if images_dir.exists():
-            for img_path in images_dir.glob("*.png"):
-                # Add to images/ folder in ZIP
-                zip_file.write(img_path, f"images/{img_path.name}")
+@router.get("/{session_id}/download-zip")
+async def download_zip(session_id: str):
+    """Download content and images as ZIP file."""
+    session_mgr = get_session_manager(session_id)
 
-    zip_buffer.seek(0)
+    # Get slug for filename
+    draft = session_mgr.state.current_draft or ""
+    slug = _final_slug(session_mgr)
 
+    # Streamed as it's built rather than buffered in memory first
     return StreamingResponse(
-        io.BytesIO(zip_buffer.read()),
+        _iter_zip(draft, slug, session_mgr.session_dir / "images"),
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{slug}.zip"'},
     )
@@ -263,10 +366,7 @@ async def download_zip(session_id: str):
 @router.post("/{session_id}/open-folder")
 async def open_folder(session_id: str):
     """Open session folder in system file manager."""
-    import platform
-    import subprocess
-
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
     folder_path = session_mgr.session_dir.resolve()
 
     try:
@@ -1,30 +1,49 @@
 """Illustration generation routes with SSE progress."""
 
 import asyncio
-import json
 import logging
-from pathlib import Path
+from collections import defaultdict
+from collections.abc import Sequence
 
 from fastapi import APIRouter
 from fastapi import Request
 from fastapi.responses import FileResponse
 from fastapi.responses import HTMLResponse
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 
-from ...session import SessionManager
+from ..responses import SSE_PING
+from ..responses import JSONResponse
+from ..responses import encode_sse_event
+from ..session_cache import get_session_manager
+from ..session_images import list_session_images
 from ..templates_config import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions")
 
+# Cache policy for generated session images. A regenerated image can reuse
+# an earlier filename, so browsers keep a copy but revalidate it by ETag
+IMAGE_CACHE_CONTROL = "no-cache"
+
+# Completion event, identical for every stream
+COMPLETE_EVENT = encode_sse_event("complete", {"success": True})
+
+# Undelivered progress messages kept per session before new ones are dropped
+MAX_QUEUED_MESSAGES = 256
+
 
 class IllustrationQueue:
-    """Message queue for illustration progress updates."""
+    """Message queue for illustration progress updates.
+
+    Bounded, and closed when its SSE client goes away, so a generation
+    that outlives its client doesn't keep accumulating messages.
+    """
 
     def __init__(self):
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED_MESSAGES)
         self.complete = False
+        self.closed = False
 
     async def put(
         self,
@@ -34,6 +53,8 @@ class IllustrationQueue:
         image_path: str | None = None,
     ):
         """Add message to queue with optional stage and progress."""
+        if self.closed:
+            return
         data: dict[str, str | int] = {"message": message}
         if stage is not None:
             data["stage"] = stage
@@ -41,15 +62,32 @@ class IllustrationQueue:
             data["progress"] = progress
         if image_path is not None:
             data["image_path"] = image_path
-        await self.queue.put(data)
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            logger.warning(f"Illustration queue full, dropping message: {message}")
 
-    async def get(self) -> dict[str, str | int]:
-        """Get next message from queue."""
+    async def get(self) -> dict[str, str | int] | None:
+        """Get next message from queue, or None once generation is complete."""
         return await self.queue.get()
 
+    async def put_many(self, messages: Sequence[tuple[str, str | None]]):
+        """Add several (message, stage) messages at once, in order."""
+        for message, stage in messages:
+            await self.put(message, stage=stage)
+
     def mark_complete(self):
-        """Mark generation as complete."""
+        """Mark generation as complete and wake the SSE stream."""
         self.complete = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # The stream notices self.complete on its next keepalive
+            pass
+
+    def close(self):
+        """Stop accepting messages once the SSE client has disconnected."""
+        self.closed = True
 
 
 # Session ID to queue mapping
@@ -59,7 +97,7 @@ illustration_queues: dict[str, IllustrationQueue] = {}
 @router.get("/{session_id}/illustrations", response_class=HTMLResponse)
 async def illustrations_page(request: Request, session_id: str):
     """Show illustrations page with editor and generation options."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
 
     # Get current draft
     draft = session_mgr.state.current_draft or ""
@@ -74,82 +112,83 @@ async def illustrations_page(request: Request, session_id: str):
     )
 
 
+def _sse_event(data: dict[str, str | int]) -> bytes:
+    """Encode the SSE event for a queued message."""
+    # Image-ready events carry image_path and have their own event type
+    event = "image-ready" if "image_path" in data else "message"
+    return encode_sse_event(event, data)
+
+
 @router.get("/{session_id}/illustrations-stream")
 async def illustrations_stream(session_id: str, style: str = "", max_images: int = 3):
     """SSE stream of illustration generation progress."""
 
     async def event_generator():
         # Get or create queue for this session
-        if session_id not in illustration_queues:
-            illustration_queues[session_id] = IllustrationQueue()
+        queue = illustration_queues.get(session_id)
+        if queue is None:
+            queue = illustration_queues[session_id] = IllustrationQueue()
             # Start generation in background
-            asyncio.create_task(run_illustration_generation(session_id, style, max_images))
-
-        queue = illustration_queues[session_id]
+            asyncio.create_task(run_illustration_generation(session_id, style, max_images, queue))
 
         try:
-            while True:
+            done = False
+            while not done:
                 try:
                     # Wait for next message with timeout for keepalive
                     data = await asyncio.wait_for(queue.get(), timeout=15.0)
-
-                    # Check if this is an image-ready event
-                    if "image_path" in data:
-                        yield {"event": "image-ready", "data": json.dumps(data)}
-                    else:
-                        yield {"event": "message", "data": json.dumps(data)}
-
                 except TimeoutError:
                     # Send keepalive
-                    yield {"event": "ping", "data": ""}
+                    yield SSE_PING
 
                     # Check if workflow completed during timeout
                     if queue.complete and queue.queue.empty():
                         break
+                    continue
+
+                # Deliver the rest of a burst without another wait_for round trip
+                while data is not None:
+                    yield _sse_event(data)
+                    try:
+                        data = queue.queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                else:
+                    done = True
 
             # Drain any remaining messages
             while not queue.queue.empty():
-                try:
-                    data = queue.queue.get_nowait()
-                    if "image_path" in data:
-                        yield {"event": "image-ready", "data": json.dumps(data)}
-                    else:
-                        yield {"event": "message", "data": json.dumps(data)}
-                except asyncio.QueueEmpty:
-                    break
+                data = queue.queue.get_nowait()
+                if data is not None:
+                    yield _sse_event(data)
 
             # Send completion event
-            yield {"event": "complete", "data": json.dumps({"success": True})}
+            yield COMPLETE_EVENT
 
         finally:
-            # Cleanup queue when client disconnects
-            if session_id in illustration_queues:
+            # Cleanup queue when client disconnects; a newer stream for the
+            # same session may have registered its own queue meanwhile
+            queue.close()
+            if illustration_queues.get(session_id) is queue:
                 del illustration_queues[session_id]
 
     return EventSourceResponse(event_generator())
 
 
-async def run_illustration_generation(session_id: str, image_style: str, max_images: int):
+async def run_illustration_generation(
+    session_id: str, image_style: str, max_images: int, queue: IllustrationQueue
+):
     """Generate illustrations using IllustrationPhase with detailed progress updates."""
-    queue = illustration_queues[session_id]
-
     try:
         # Load session
-        session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+        session_mgr = get_session_manager(session_id)
 
         # Get current draft
         draft = session_mgr.state.current_draft or ""
 
         # Save draft to temporary file for IllustrationPhase
         temp_draft_path = session_mgr.session_dir / "temp_draft.md"
-        temp_draft_path.write_text(draft)
-
-        # Set up API key
-        import os
-
-        api_key = session_mgr.state.api_key or os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            os.environ["ANTHROPIC_API_KEY"] = api_key
+        await asyncio.to_thread(temp_draft_path.write_text, draft)
 
         # Images output directory
         images_dir = session_mgr.session_dir / "images"
@@ -168,7 +207,9 @@ async def run_illustration_generation(session_id: str, image_style: str, max_ima
             return
 
         # Create phase instance
-        phase = IllustrationPhase()
+        # The session's key goes to this run's phase rather than into
+        # os.environ, where it would leak to every other session
+        phase = IllustrationPhase(anthropic_api_key=session_mgr.state.api_key)
 
         # Stage 1: Analyze content
         await queue.put("Analyzing content structure...", stage="analyze")
@@ -187,10 +228,10 @@ async def run_illustration_generation(session_id: str, image_style: str, max_ima
         await queue.put("Generating contextual prompts...", stage="prompts")
         prompts = await phase._generate_prompts(points, temp_draft_path, image_style)
 
-        for i, prompt in enumerate(prompts):
-            await queue.put(f"Generated prompt {i + 1}/{len(prompts)}", stage="prompts")
-
-        await queue.put(f"All {len(prompts)} prompts ready", stage="prompts")
+        await queue.put_many(
+            [(f"Generated prompt {i + 1}/{len(prompts)}", "prompts") for i in range(len(prompts))]
+            + [(f"All {len(prompts)} prompts ready", "prompts")]
+        )
 
         # Stage 3: Generate images in parallel
         await queue.put(f"Generating {len(prompts)} images in parallel...", stage="prompts")
@@ -246,28 +287,41 @@ async def run_illustration_generation(session_id: str, image_style: str, max_ima
             current_content = draft
             lines = current_content.split("\n")
 
-            # Insert images at appropriate positions (after sections)
-            # Work backwards to maintain line numbers
+            # Images to insert after each original line (after sections),
+            # applied in one pass below
+            insertions: dict[int, list[str]] = defaultdict(list)
+            insert_messages: list[tuple[str, str | None]] = []
+            image_filenames = list(image_results)
             sorted_points = sorted(enumerate(points), key=lambda x: x[1].line_number, reverse=True)
 
             inserted_count = 0
             for i, point in sorted_points:
-                if i < len(image_results):
+                if i < len(image_filenames):
                     # Get the Nth generated image
-                    image_filename = list(image_results.keys())[i]
+                    image_filename = image_filenames[i]
                     # Insert image markdown with 50% width
                     image_markdown = f'\n<img src="images/{image_filename}.png" alt="{point.section_title}" style="width: 50%; height: auto; display: block; margin: 1.5rem auto;">\n'
 
                     # Insert after the line number
                     insert_pos = point.line_number
                     if insert_pos < len(lines):
-                        lines.insert(insert_pos + 1, image_markdown)
+                        insertions[insert_pos].append(image_markdown)
                         inserted_count += 1
-                        await queue.put(f"Inserted at line {insert_pos} ({point.suggested_placement})", stage="insert")
+                        insert_messages.append(
+                            (f"Inserted at line {insert_pos} ({point.suggested_placement})", "insert")
+                        )
+
+            illustrated_lines: list[str] = []
+            for line_number, line in enumerate(lines):
+                illustrated_lines.append(line)
+                if line_number in insertions:
+                    # Last-placed image first, as successive inserts at one line had it
+                    illustrated_lines.extend(reversed(insertions[line_number]))
+            await queue.put_many(insert_messages)
 
             # Update draft with images
-            illustrated_content = "\n".join(lines)
-            session_mgr.update_draft(illustrated_content)
+            illustrated_content = "\n".join(illustrated_lines)
+            await asyncio.to_thread(session_mgr.update_draft, illustrated_content)
 
             await queue.put(f"✓ Successfully inserted {inserted_count} images", stage="insert")
         else:
@@ -284,21 +338,19 @@ async def run_illustration_generation(session_id: str, image_style: str, max_ima
 @router.get("/{session_id}/images")
 async def get_images(session_id: str):
     """Get list of all images for this session."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
     images_dir = session_mgr.session_dir / "images"
 
-    if not images_dir.exists():
-        return JSONResponse({"images": []})
-
-    # Get all image files
+    # Get all image files; DirEntry.stat() is cached, so one stat per image
     image_files = []
-    for img_path in sorted(images_dir.glob("*.png")):
+    for entry in list_session_images(images_dir):
+        stat_result = entry.stat()
         image_files.append(
             {
-                "filename": img_path.name,
-                "path": f"images/{img_path.name}",
-                "size": img_path.stat().st_size,
-                "created_at": img_path.stat().st_mtime,
+                "filename": entry.name,
+                "path": f"images/{entry.name}",
+                "size": stat_result.st_size,
+                "created_at": stat_result.st_mtime,
             }
         )
 
@@ -306,72 +358,29 @@ async def get_images(session_id: str):
 
 
 @router.get("/{session_id}/images/{filename}")
-async def get_image_file(session_id: str, filename: str):
+async def get_image_file(request: Request, session_id: str, filename: str):
     """Serve individual image file."""
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    session_mgr = get_session_manager(session_id)
     image_path = session_mgr.session_dir / "images" / filename
 
-    if not image_path.exists():
+    # One stat serves both the existence check and the response headers
+    try:
+        stat_result = image_path.stat()
+    except FileNotFoundError:
         return JSONResponse({"error": "Image not found"}, status_code=404)
 
-    return FileResponse(image_path)
-
-
-@router.post("/{session_id}/render-markdown")
-async def render_markdown(request: Request, session_id: str):
-    """Render markdown to HTML with image support."""
-    form_data = await request.form()
-    content = form_data.get("content", "")
-
-    # Simple markdown to HTML conversion
-    # (In production, use a proper markdown library like python-markdown)
-    import re
-
-    html = str(content)
-
-    # Convert headers
-    html = re.sub(r"^### (.*?)$", r"<h3>\1</h3>", html, flags=re.MULTILINE)
-    html = re.sub(r"^## (.*?)$", r"<h2>\1</h2>", html, flags=re.MULTILINE)
-    html = re.sub(r"^# (.*?)$", r"<h1>\1</h1>", html, flags=re.MULTILINE)
-
-    # Convert images - update paths to serve from session
-    html = re.sub(
-        r"!\[(.*?)\]\((images/.*?)\)",
-        rf'<img src="/sessions/{session_id}/\2" alt="\1">',
-        html,
-    )
-
-    # Convert bold
-    html = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", html)
-
-    # Convert italic
-    html = re.sub(r"\*(.*?)\*", r"<em>\1</em>", html)
-
-    # Convert code
-    html = re.sub(r"`(.*?)`", r"<code>\1</code>", html)
-
-    # Convert paragraphs
-    lines = html.split("\n")
-    paragraphs = []
-    current_p = []
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("<h") or line.startswith("<img"):
-            if current_p:
-                paragraphs.append("<p>" + " ".join(current_p) + "</p>")
-                current_p = []
-            paragraphs.append(line)
-        elif line:
-            current_p.append(line)
-        else:
-            if current_p:
-                paragraphs.append("<p>" + " ".join(current_p) + "</p>")
-                current_p = []
-
-    if current_p:
-        paragraphs.append("<p>" + " ".join(current_p) + "</p>")
+    # A regenerated image can reuse a filename, so browsers revalidate every
+    # use; the size/mtime ETag makes that a bodiless 304 when unchanged
+    headers = {
+        "ETag": f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"',
+        "Cache-Control": IMAGE_CACHE_CONTROL,
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or headers["ETag"] in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
 
-    html = "\n".join(paragraphs)
+    return FileResponse(image_path, stat_result=stat_result, headers=headers)
 
-    return HTMLResponse(html)
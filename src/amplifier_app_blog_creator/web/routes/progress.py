@@ -1,34 +1,61 @@
 """Progress streaming routes using SSE."""
 
 import asyncio
-import json
 import logging
+import os
+from collections import deque
+from itertools import islice
 from pathlib import Path
 
 from fastapi import APIRouter
+from fastapi import HTTPException
 from fastapi import Request
 from fastapi.responses import HTMLResponse
 from sse_starlette.sse import EventSourceResponse
 
-from ...session import SessionManager
 from ..recipe_executor import RecipeExecutor
+from ..responses import SSE_PING
+from ..responses import encode_sse_event
+from ..session_cache import get_session_manager
+from ..session_cache import is_valid_session_id
 from ..templates_config import templates
+from .content import prerender_review
+from .sessions import MAX_IDEA_FILE_BYTES
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions")
 
 
+# Recipe run by the web workflow (relative to the server's working directory)
+RECIPE_PATH = Path("amplifier-bundle-blog-creator/recipes/create-blog-post.yaml")
+
+# Undelivered progress messages kept per session; oldest dropped beyond this
+MAX_QUEUED_MESSAGES = 256
+
+
 class MessageQueue:
-    """Simple message queue for progress updates."""
+    """Simple message queue for progress updates.
+
+    A deque plus an Event: the workflow is the only producer and put never
+    blocks, so asyncio.Queue's getter/putter futures are pure overhead here.
+    Messages aren't consumed; each SSE stream reads from its own cursor, so
+    a second tab (or a reload) sees the full run rather than whatever the
+    first stream left behind. Bounded so the log can't grow without limit;
+    on overflow the oldest message is dropped, keeping the latest progress.
+    """
 
     def __init__(self):
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.messages: deque[dict[str, str | int]] = deque(maxlen=MAX_QUEUED_MESSAGES)
+        self.total = 0  # Messages ever queued; subscriber cursors count against this
         self.complete = False
         self.current_stage: str | None = None
         self.current_stage_index: int = -1
+        self.task: asyncio.Task | None = None  # Workflow feeding this queue
+        self.subscribers = 0  # Open SSE streams reading this queue
+        self._ready = asyncio.Event()  # Set when messages arrive or on completion
 
-    async def put(self, message: str, stage: str | None = None, stage_index: int | None = None):
-        """Add message to queue with optional stage info."""
+    def _build(self, message: str, stage: str | None, stage_index: int | None) -> dict[str, str | int]:
+        """Build message payload and track current stage."""
         data: dict[str, str | int] = {"message": message}
         if stage is not None:
             data["stage"] = stage
@@ -36,90 +63,165 @@ class MessageQueue:
         if stage_index is not None:
             data["stage_index"] = stage_index
             self.current_stage_index = stage_index
-        await self.queue.put(data)
+        return data
+
+    def _enqueue(self, data: dict[str, str | int]):
+        """Enqueue without blocking; the bounded deque drops the oldest when full.
+
+        A message identical to the last one queued is dropped, whether or
+        not streams have sent that one yet: a back-to-back repeat shows the
+        client nothing new. Only exact repeats are dropped; the progress page
+        detects stage changes from message text, so distinct messages always
+        go out.
+        """
+        if self.messages and data == self.messages[-1]:
+            return
+        self.messages.append(data)
+        self.total += 1
+        self._ready.set()
 
-    async def get(self) -> dict[str, str | int]:
-        """Get next message from queue."""
-        return await self.queue.get()
+    async def put(self, message: str, stage: str | None = None, stage_index: int | None = None):
+        """Add message to queue with optional stage info."""
+        self._enqueue(self._build(message, stage, stage_index))
+
+    async def put_many(self, messages: list[tuple[str, str | None, int | None]]):
+        """Add several (message, stage, stage_index) messages at once, in order."""
+        for message, stage, stage_index in messages:
+            self._enqueue(self._build(message, stage, stage_index))
+
+    async def wait(self, cursor: int):
+        """Wait until a message is queued past cursor or the workflow is complete."""
+        while self.total <= cursor and not self.complete:
+            self._ready.clear()
+            await self._ready.wait()
+
+    def read_from(self, cursor: int) -> tuple[list[dict[str, str | int]], int]:
+        """Get every message queued since cursor, and the cursor to read from next.
+
+        Messages that fell off the front of the deque before this reader
+        got to them are skipped.
+        """
+        unread = min(self.total - cursor, len(self.messages))
+        if unread <= 0:
+            return [], self.total
+        return list(islice(self.messages, len(self.messages) - unread, None)), self.total
 
     def mark_complete(self):
-        """Mark workflow as complete."""
+        """Mark workflow as complete and wake any waiting stream."""
         self.complete = True
+        self._ready.set()
 
 
 # Session ID to queue mapping
 progress_queues: dict[str, MessageQueue] = {}
 
+# The page only needs session_id, so render the compiled template directly
+# rather than going through a TemplateResponse lookup on every load
+_progress_template = templates.get_template("progress.html")
+
 
 @router.get("/{session_id}/progress", response_class=HTMLResponse)
 async def progress_page(request: Request, session_id: str):
     """Show progress page."""
-    return templates.TemplateResponse(
-        "progress.html",
-        {
-            "request": request,
-            "session_id": session_id,
-        },
-    )
+    return HTMLResponse(_progress_template.render(session_id=session_id))
+
+
+def _complete_event(session_id: str) -> bytes:
+    """Build the SSE event that sends the client on to the review page."""
+    return encode_sse_event("complete", {"redirect": f"/sessions/{session_id}/review"})
 
 
 @router.get("/{session_id}/progress-stream")
-async def progress_stream(session_id: str):
+async def progress_stream(request: Request, session_id: str):
     """SSE stream of progress updates."""
+    # Rejected here rather than by get_session_manager inside the
+    # generator, where the response has already started
+    if not is_valid_session_id(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
 
     async def event_generator():
-        # Get or create queue for this session
-        if session_id not in progress_queues:
-            progress_queues[session_id] = MessageQueue()
+        # Get or create queue for this session. Nothing is awaited between
+        # the lookup and the insert, so concurrent connects on the event
+        # loop can't both start a workflow.
+        queue = progress_queues.get(session_id)
+        if queue is None:
+            if get_session_manager(session_id).state.workflow_complete:
+                # Already ran to completion (e.g. the progress page was
+                # reloaded); don't run the recipe again
+                yield _complete_event(session_id)
+                return
+            queue = progress_queues[session_id] = MessageQueue()
             # Start workflow in background
-            asyncio.create_task(run_workflow(session_id))
-
-        queue = progress_queues[session_id]
+            queue.task = asyncio.create_task(run_workflow(session_id, queue))
+        queue.subscribers += 1
+        cursor = 0
 
         try:
-            while not queue.complete:
+            while True:
                 try:
-                    # Wait for next message with timeout for keepalive
-                    data = await asyncio.wait_for(queue.get(), timeout=15.0)
-                    yield {"event": "message", "data": json.dumps(data)}
+                    # Wait for messages with timeout for keepalive
+                    await asyncio.wait_for(queue.wait(cursor), timeout=15.0)
                 except TimeoutError:
+                    # Quiet for a whole keepalive interval: stop if the
+                    # client is gone rather than waiting on a failed write
+                    if await request.is_disconnected():
+                        logger.info(f"Progress client for session {session_id} disconnected")
+                        return
                     # Send keepalive
-                    yield {"event": "ping", "data": ""}
+                    yield SSE_PING
+                    continue
+
+                # Everything unread goes out in the same write: one ASGI
+                # send for the burst, still one SSE event per message
+                messages, cursor = queue.read_from(cursor)
+                if messages:
+                    yield b"".join(encode_sse_event("message", data) for data in messages)
+                elif queue.complete:
+                    break
 
             # Send completion event
-            yield {"event": "complete", "data": json.dumps({"redirect": f"/sessions/{session_id}/review"})}
+            yield _complete_event(session_id)
 
         finally:
-            # Cleanup queue when client disconnects
-            if session_id in progress_queues:
-                del progress_queues[session_id]
+            # Cleanup queue when the last client disconnects. A workflow
+            # nobody is watching is stopped rather than left running into
+            # a queue that will never be read; once it has marked itself
+            # complete it is only prerendering the review page, so it's
+            # left to finish.
+            queue.subscribers -= 1
+            if not queue.subscribers:
+                if progress_queues.get(session_id) is queue:
+                    del progress_queues[session_id]
+                if queue.task is not None and not queue.task.done() and not queue.complete:
+                    # The task terminates the recipe subprocess as it unwinds
+                    queue.task.cancel()
+                queue.messages.clear()
 
     return EventSourceResponse(event_generator())
 
 
-async def run_workflow(session_id: str):
-    """Run blog creation workflow via recipe execution."""
-    queue = progress_queues[session_id]
+def _read_idea(idea_path: Path) -> str:
+    """Read the idea file, refusing one that has grown past the size limit."""
+    size = idea_path.stat().st_size
+    if size > MAX_IDEA_FILE_BYTES:
+        raise ValueError(f"Idea file is too large ({size} bytes, max {MAX_IDEA_FILE_BYTES})")
+    return idea_path.read_text()
 
+
+async def run_workflow(session_id: str, queue: MessageQueue):
+    """Run blog creation workflow via recipe execution."""
     try:
-        # Load session
-        session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+        session_mgr = get_session_manager(session_id)
 
         # Get API key from session state (stored during configuration)
-        # Recipe execution reads from environment, so set it here
-        import os
-
         api_key = session_mgr.state.api_key or os.getenv("ANTHROPIC_API_KEY")
 
         if not api_key:
             await queue.put("Error: No API key configured", stage="error")
             return
 
-        os.environ["ANTHROPIC_API_KEY"] = api_key
-
         # Read idea file content
-        idea_path = Path(session_mgr.state.idea_path)
-        topic_content = idea_path.read_text()
+        topic_content = await asyncio.to_thread(_read_idea, Path(session_mgr.state.idea_path))
 
         # Build recipe context
         recipe_context = {
@@ -131,16 +233,33 @@ async def run_workflow(session_id: str):
         }
 
         # Execute recipe
-        recipe_path = Path("amplifier-bundle-blog-creator/recipes/create-blog-post.yaml")
-        executor = RecipeExecutor(recipe_path)
+        executor = RecipeExecutor(RECIPE_PATH)
 
         success = await executor.execute(
-            context=recipe_context, session_dir=session_mgr.session_dir, queue=queue
+            context=recipe_context,
+            session_dir=session_mgr.session_dir,
+            queue=queue,
+            # Recipe execution reads the key from its environment; pass it to
+            # this run's subprocess rather than setting it process-wide
+            env={"ANTHROPIC_API_KEY": api_key},
         )
 
-        if not success:
+        if success:
+            # Re-fetch: reloads if the recipe run rewrote state.json
+            session_mgr = get_session_manager(session_id)
+            session_mgr.state.workflow_complete = True
+            await asyncio.to_thread(session_mgr.save)
+            # Send the client on its way, then render the review page while
+            # its redirect request is in flight
+            queue.mark_complete()
+            await prerender_review(session_id, session_mgr)
+        else:
             await queue.put("Error: Recipe execution failed", stage="error")
 
+    except asyncio.CancelledError:
+        logger.info(f"Workflow for session {session_id} cancelled")
+        raise
+
     except Exception as e:
         logger.error(f"Workflow error: {e}", exc_info=True)
         await queue.put(f"Error: {str(e)}", stage="error")
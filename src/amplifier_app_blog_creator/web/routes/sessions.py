@@ -1,6 +1,12 @@
 """Session management routes."""
 
+import asyncio
 import logging
+import os
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 from typing import Annotated
 
@@ -12,42 +18,99 @@ from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 
 from ...session import SessionManager
+from ...vendored_toolkit import aread_json
+from ...vendored_toolkit import awrite_json
+from ..responses import StaticHTMLResponse
+from ..session_cache import SESSIONS_DIR
+from ..session_cache import is_valid_session_id
 from ..templates_config import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions")
 
 
-@router.get("/recent-paths")
-async def get_recent_paths():
-    """Get recent file/folder paths from previous sessions."""
+# Index of recently used paths, kept up to date by start_workflow so the
+# setup page doesn't have to read every session's state.json. A full scan
+# only happens when the index is missing or unreadable.
+RECENT_PATHS_FILE = SESSIONS_DIR.parent / "blog_creator_recent_paths.json"
+MAX_RECENT_PATHS = 10
+
+_recent_paths_lock = asyncio.Lock()
+
+
+async def _scan_recent_paths() -> dict[str, list[str]]:
+    """Build the recent-paths index from every session's state file."""
     recent_ideas = []
     recent_writings = []
 
-    sessions_dir = Path(".data/blog_creator")
-    if sessions_dir.exists():
-        for session_dir in sessions_dir.iterdir():
-            if session_dir.is_dir():
-                state_file = session_dir / "state.json"
-                if state_file.exists():
-                    try:
-                        import json
-
-                        state = json.loads(state_file.read_text())
-                        if state.get("idea_path"):
-                            recent_ideas.append(state["idea_path"])
-                        if state.get("writings_dir"):
-                            recent_writings.append(state["writings_dir"])
-                    except Exception:
-                        pass
-
-    # Return unique paths, most recent first (reversed)
+    if SESSIONS_DIR.exists():
+        state_files = [d / "state.json" for d in SESSIONS_DIR.iterdir() if (d / "state.json").is_file()]
+        # Read all state files concurrently in worker threads
+        states = await asyncio.gather(*(aread_json(f) for f in state_files), return_exceptions=True)
+        for state in states:
+            if not isinstance(state, dict):
+                continue
+            if state.get("idea_path"):
+                recent_ideas.append(state["idea_path"])
+            if state.get("writings_dir"):
+                recent_writings.append(state["writings_dir"])
+
+    # Unique paths, most recent first (reversed)
+    return {
+        "idea_files": list(dict.fromkeys(reversed(recent_ideas)))[:MAX_RECENT_PATHS],
+        "writings_dirs": list(dict.fromkeys(reversed(recent_writings)))[:MAX_RECENT_PATHS],
+    }
+
+
+async def _load_recent_paths() -> dict[str, list[str]]:
+    """Load the recent-paths index, rebuilding it by a full scan if missing."""
+    try:
+        recent = await aread_json(RECENT_PATHS_FILE)
+    except (OSError, ValueError):
+        recent = None
+    if isinstance(recent, dict):
+        return recent
+
+    recent = await _scan_recent_paths()
+    try:
+        await awrite_json(recent, RECENT_PATHS_FILE, compact=True)
+    except OSError as e:
+        logger.warning(f"Could not write recent paths index: {e}")
+    return recent
+
+
+async def _remember_recent_paths(idea_path: str, writings_dir: str) -> None:
+    """Move the paths a workflow was started with to the front of the index."""
+    async with _recent_paths_lock:
+        recent = await _load_recent_paths()
+        recent = {
+            "idea_files": list(dict.fromkeys([idea_path, *recent.get("idea_files", [])]))[:MAX_RECENT_PATHS],
+            "writings_dirs": list(dict.fromkeys([writings_dir, *recent.get("writings_dirs", [])]))[
+                :MAX_RECENT_PATHS
+            ],
+        }
+        await awrite_json(recent, RECENT_PATHS_FILE, compact=True)
+
+
+@router.get("/recent-paths")
+async def get_recent_paths():
+    """Get recent file/folder paths from previous sessions."""
+    recent = await _load_recent_paths()
     return {
-        "idea_files": list(dict.fromkeys(reversed(recent_ideas)))[:10],
-        "writings_dirs": list(dict.fromkeys(reversed(recent_writings)))[:10],
+        "idea_files": recent.get("idea_files", []),
+        "writings_dirs": recent.get("writings_dirs", []),
     }
 
 
+# Largest idea file a workflow will read, and the most additional
+# instructions kept; both end up in every LLM stage's prompt
+MAX_IDEA_FILE_BYTES = 1024 * 1024
+MAX_INSTRUCTIONS_CHARS = 10_000
+
+# Looked up once; setup.html uses nothing from the request but session_id
+_setup_template = templates.get_template("setup.html")
+
+
 class PathValidationRequest(BaseModel):
     path: str
     type: str  # "file" or "directory"
@@ -74,13 +137,185 @@ async def new_session(request: Request):
     session_mgr = SessionManager()
     request.session["session_id"] = session_mgr.state.session_id
 
-    return templates.TemplateResponse(
-        "setup.html",
-        {
-            "request": request,
-            "session_id": session_mgr.state.session_id,
-        },
-    )
+    return HTMLResponse(_setup_template.render(session_id=session_mgr.state.session_id))
+
+
+# Path validation feedback fragments returned by validate-path; the static
+# ones are encoded once here.
+_PATH_MISSING_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                Path does not exist
+            </div>""".encode()
+
+_NOT_A_FILE_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                Path is not a file
+            </div>""".encode()
+
+_BAD_SUFFIX_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                File must be .md or .txt
+            </div>""".encode()
+
+_FILE_TOO_LARGE_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                File is too large (max 1 MB)
+            </div>""".encode()
+
+_NOT_A_DIRECTORY_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                Path is not a directory
+            </div>""".encode()
+
+_NO_SAMPLES_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                No .md files found
+            </div>""".encode()
+
+_MISSING_INPUT_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                Missing path or type
+            </div>""".encode()
+
+_INVALID_SESSION_HTML = b'<div class="error">Invalid session ID</div>'
+
+_VALID_FILE_HTML = """<div class="feedback feedback-valid">
+                <span class="feedback-icon">✓</span>
+                Valid - {word_count} words
+            </div>"""
+
+_VALID_DIRECTORY_HTML = """<div class="feedback feedback-valid">
+                <span class="feedback-icon">✓</span>
+                Valid - {file_count} samples found
+            </div>"""
+
+_ERROR_HTML = """<div class="feedback feedback-invalid">
+                <span class="feedback-icon">⚠</span>
+                Error: {error}
+            </div>"""
+
+
+# Read size for counting words in an idea file
+WORD_COUNT_CHUNK_SIZE = 64 * 1024
+
+# Larger idea files get a word count estimated from their size; the setup
+# page only shows it as a sanity check
+APPROX_WORD_COUNT_BYTES = 512 * 1024
+AVG_BYTES_PER_WORD = 6
+
+
+def _count_words(path: Path) -> int:
+    """Count whitespace-separated words, reading the file in binary chunks.
+
+    bytes.split() counts each chunk at C speed without decoding the text;
+    a word straddling a chunk boundary is counted once.
+    """
+    count = 0
+    in_word = False
+    with open(path, "rb") as f:
+        while chunk := f.read(WORD_COUNT_CHUNK_SIZE):
+            count += len(chunk.split())
+            if in_word and not chunk[:1].isspace():
+                count -= 1
+            in_word = not chunk[-1:].isspace()
+    return count
+
+
+# Sample counting stops here; the setup page shows "1000+"
+MAX_COUNTED_SAMPLES = 1000
+
+
+def _count_samples(directory: Path) -> int:
+    """Count the .md files directly inside a directory, up to MAX_COUNTED_SAMPLES.
+
+    Dotfiles (e.g. macOS ._*.md resource forks) are not samples.
+    """
+    count = 0
+    # One scandir pass; DirEntry.is_file() is usually answered from the
+    # directory listing itself, without a stat per entry
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".md") and not name.startswith(".") and entry.is_file():
+                count += 1
+                if count >= MAX_COUNTED_SAMPLES:
+                    break
+    return count
+
+
+# Word and sample counts from recent validations, keyed by path, mtime and
+# size so any change to the file (or to a directory's listing) invalidates them
+MAX_CACHED_COUNTS = 64
+_counts: OrderedDict[tuple[str, int, int], int] = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+def _cached_count(path: Path, st: os.stat_result, count: Callable[[Path], int]) -> int:
+    """Return count(path), reusing the last result while the path's stat is unchanged.
+
+    Args:
+        path: File or directory to count
+        st: The path's current stat, from the caller
+        count: _count_words or _count_samples
+    """
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    with _counts_lock:
+        result = _counts.get(key)
+        if result is not None:
+            _counts.move_to_end(key)
+            return result
+
+    result = count(path)
+
+    with _counts_lock:
+        _counts[key] = result
+        while len(_counts) > MAX_CACHED_COUNTS:
+            _counts.popitem(last=False)
+    return result
+
+
+def _check_path(path: str, type: str) -> HTMLResponse | None:
+    """Check a path on disk and build the validation feedback fragment.
+
+    Synchronous (stats, reads and scans); run it in a worker thread.
+    """
+    p = Path(path).expanduser()
+
+    # One stat answers exists / is-file / is-dir / size
+    try:
+        st = p.stat()
+    except OSError:
+        return StaticHTMLResponse(_PATH_MISSING_HTML)
+
+    if type == "file":
+        if not stat.S_ISREG(st.st_mode):
+            return StaticHTMLResponse(_NOT_A_FILE_HTML)
+
+        if p.suffix not in (".md", ".txt"):
+            return StaticHTMLResponse(_BAD_SUFFIX_HTML)
+
+        if st.st_size > MAX_IDEA_FILE_BYTES:
+            return StaticHTMLResponse(_FILE_TOO_LARGE_HTML)
+
+        if st.st_size > APPROX_WORD_COUNT_BYTES:
+            word_count = f"~{st.st_size // AVG_BYTES_PER_WORD}"
+        else:
+            word_count = _cached_count(p, st, _count_words) if st.st_size else 0
+
+        return HTMLResponse(_VALID_FILE_HTML.format(word_count=word_count))
+
+    if type == "directory":
+        if not stat.S_ISDIR(st.st_mode):
+            return StaticHTMLResponse(_NOT_A_DIRECTORY_HTML)
+
+        file_count = _cached_count(p, st, _count_samples)
+
+        if file_count == 0:
+            return StaticHTMLResponse(_NO_SAMPLES_HTML)
+
+        if file_count >= MAX_COUNTED_SAMPLES:
+            file_count = f"{MAX_COUNTED_SAMPLES}+"
+        return HTMLResponse(_VALID_DIRECTORY_HTML.format(file_count=file_count))
 
 
 @router.post("/{session_id}/validate-path")
@@ -107,96 +342,45 @@ async def validate_path(
         logger.info(f"Validation: type={type}, path={path}")
 
         if not path or not type:
-            return HTMLResponse(
-                """<div class="feedback feedback-invalid">
-                    <span class="feedback-icon">⚠</span>
-                    Missing path or type
-                </div>""",
-                status_code=200,
-            )
-
-        path = str(path)
-        type = str(type)
-        p = Path(path).expanduser()
-
-        if not p.exists():
-            return HTMLResponse(
-                """<div class="feedback feedback-invalid">
-                    <span class="feedback-icon">⚠</span>
-                    Path does not exist
-                </div>""",
-                status_code=200,
-            )
-
-        if type == "file":
-            if not p.is_file():
-                return HTMLResponse(
-                    """<div class="feedback feedback-invalid">
-                        <span class="feedback-icon">⚠</span>
-                        Path is not a file
-                    </div>""",
-                    status_code=200,
-                )
-
-            if p.suffix not in [".md", ".txt"]:
-                return HTMLResponse(
-                    """<div class="feedback feedback-invalid">
-                        <span class="feedback-icon">⚠</span>
-                        File must be .md or .txt
-                    </div>""",
-                    status_code=200,
-                )
-
-            content = p.read_text()
-            word_count = len(content.split())
-
-            return HTMLResponse(
-                f"""<div class="feedback feedback-valid">
-                    <span class="feedback-icon">✓</span>
-                    Valid - {word_count} words
-                </div>""",
-                status_code=200,
-            )
-
-        if type == "directory":
-            if not p.is_dir():
-                return HTMLResponse(
-                    """<div class="feedback feedback-invalid">
-                        <span class="feedback-icon">⚠</span>
-                        Path is not a directory
-                    </div>""",
-                    status_code=200,
-                )
-
-            md_files = list(p.glob("*.md"))
-            file_count = len(md_files)
-
-            if file_count == 0:
-                return HTMLResponse(
-                    """<div class="feedback feedback-invalid">
-                        <span class="feedback-icon">⚠</span>
-                        No .md files found
-                    </div>""",
-                    status_code=200,
-                )
-
-            return HTMLResponse(
-                f"""<div class="feedback feedback-valid">
-                    <span class="feedback-icon">✓</span>
-                    Valid - {file_count} samples found
-                </div>""",
-                status_code=200,
-            )
+            return StaticHTMLResponse(_MISSING_INPUT_HTML)
+
+        # Filesystem checks block; keep them off the event loop
+        return await asyncio.to_thread(_check_path, str(path), str(type))
 
     except Exception as e:
         logger.error(f"Path validation error: {e}")
-        return HTMLResponse(
-            f"""<div class="feedback feedback-invalid">
-                <span class="feedback-icon">⚠</span>
-                Error: {str(e)}
-            </div>""",
-            status_code=500,
-        )
+        return HTMLResponse(_ERROR_HTML.format(error=e), status_code=500)
+
+
+def _resolve_workflow_paths(idea_path: str, writings_dir: str) -> tuple[Path, Path, HTMLResponse | None]:
+    """Expand the submitted paths to absolute and check them before starting a workflow.
+
+    Synchronous (resolves and stats); run it in a worker thread.
+
+    Returns:
+        The absolute idea file and writings directory paths, plus an error
+        response if either is unusable (None when both are fine)
+    """
+    # Expand paths to absolute (handles ~, relative paths, etc.)
+    idea_path_abs = Path(idea_path).expanduser().resolve()
+    writings_dir_abs = Path(writings_dir).expanduser().resolve()
+
+    # Validate paths exist before starting workflow
+    error = None
+    if not idea_path_abs.exists():
+        error = f"Idea file not found: {idea_path_abs}"
+    elif not idea_path_abs.is_file():
+        error = f"Idea path is not a file: {idea_path_abs}"
+    elif idea_path_abs.stat().st_size > MAX_IDEA_FILE_BYTES:
+        error = f"Idea file is too large (max 1 MB): {idea_path_abs}"
+    elif not writings_dir_abs.exists():
+        error = f"Writings directory not found: {writings_dir_abs}"
+    elif not writings_dir_abs.is_dir():
+        error = f"Writings path is not a directory: {writings_dir_abs}"
+
+    if error is None:
+        return idea_path_abs, writings_dir_abs, None
+    return idea_path_abs, writings_dir_abs, HTMLResponse(f'<div class="error">{error}</div>', status_code=400)
 
 
 @router.post("/{session_id}/start-workflow")
@@ -208,29 +392,20 @@ async def start_workflow(
     instructions: Annotated[str | None, Form()] = None,
 ):
     """Start the blog creation workflow."""
-    # Store paths in session for progress stage
-    session_mgr = SessionManager(Path(f".data/blog_creator/{session_id}"))
+    if not is_valid_session_id(session_id):
+        return StaticHTMLResponse(_INVALID_SESSION_HTML, status_code=400)
 
-    # Expand paths to absolute (handles ~, relative paths, etc.)
-    idea_path_abs = Path(idea_path).expanduser().resolve()
-    writings_dir_abs = Path(writings_dir).expanduser().resolve()
+    # Resolving and checking the paths hits the filesystem; keep it off the event loop
+    idea_path_abs, writings_dir_abs, error = await asyncio.to_thread(
+        _resolve_workflow_paths, idea_path, writings_dir
+    )
+    if error is not None:
+        return error
 
-    # Validate paths exist before starting workflow
-    if not idea_path_abs.exists():
-        return HTMLResponse(f'<div class="error">Idea file not found: {idea_path_abs}</div>', status_code=400)
-    if not idea_path_abs.is_file():
-        return HTMLResponse(f'<div class="error">Idea path is not a file: {idea_path_abs}</div>', status_code=400)
-    if not writings_dir_abs.exists():
-        return HTMLResponse(
-            f'<div class="error">Writings directory not found: {writings_dir_abs}</div>', status_code=400
-        )
-    if not writings_dir_abs.is_dir():
-        return HTMLResponse(
-            f'<div class="error">Writings path is not a directory: {writings_dir_abs}</div>', status_code=400
-        )
+    # Store paths in session for progress stage
+    session_mgr = await asyncio.to_thread(SessionManager, SESSIONS_DIR / session_id)
 
-    session_mgr.state.idea_path = str(idea_path_abs)
-    session_mgr.state.writings_dir = str(writings_dir_abs)
+    fields = {"idea_path": str(idea_path_abs), "writings_dir": str(writings_dir_abs)}
 
     # Transfer API key from HTTP session to SessionManager state
     # (Core stages read from environment, which will be set from session state)
@@ -238,11 +413,16 @@ async def start_workflow(
 
     api_key = get_api_key(request)
     if api_key:
-        session_mgr.state.api_key = api_key
+        fields["api_key"] = api_key
 
     if instructions:
-        session_mgr.state.additional_instructions = instructions
-    session_mgr.save()
+        fields["additional_instructions"] = instructions[:MAX_INSTRUCTIONS_CHARS]
+    await asyncio.to_thread(session_mgr.update, **fields)
+
+    try:
+        await _remember_recent_paths(fields["idea_path"], fields["writings_dir"])
+    except OSError as e:
+        logger.warning(f"Could not update recent paths index: {e}")
 
     # Redirect to progress page
     return RedirectResponse(f"/sessions/{session_id}/progress", status_code=303)
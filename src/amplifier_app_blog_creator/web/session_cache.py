@@ -0,0 +1,59 @@
+"""SessionManager cache shared by web routes.
+
+Routes used to build a new SessionManager (and re-read state.json) on
+every request. Managers are kept per session_id and reused as long as
+state.json hasn't been rewritten by another writer since this manager
+last loaded or saved it.
+"""
+
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from ..session import SessionManager
+
+# Web sessions live here, one directory per session_id (relative to the
+# server's working directory, like the CLI's default)
+SESSIONS_DIR = Path(".data/blog_creator")
+
+# Session IDs are timestamps such as 20250101_120000 (SessionManager's
+# default); this rejects anything that could name a path outside SESSIONS_DIR
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# Most recently used sessions kept in memory
+MAX_CACHED_SESSIONS = 64
+
+_sessions: OrderedDict[str, SessionManager] = OrderedDict()
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    """Check a session ID's shape without touching the filesystem."""
+    return _SESSION_ID_RE.fullmatch(session_id) is not None
+
+
+def get_session_manager(session_id: str) -> SessionManager:
+    """Get the cached SessionManager for a session, reloading if changed on disk.
+
+    Raises:
+        HTTPException: 404 if session_id isn't a well-formed session ID
+    """
+    if not is_valid_session_id(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    session_mgr = _sessions.get(session_id)
+    if session_mgr is not None:
+        try:
+            mtime_ns = session_mgr.state_file.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and mtime_ns == session_mgr.state_mtime_ns:
+            _sessions.move_to_end(session_id)
+            return session_mgr
+
+    session_mgr = SessionManager(SESSIONS_DIR / session_id)
+    _sessions[session_id] = session_mgr
+    _sessions.move_to_end(session_id)
+    while len(_sessions) > MAX_CACHED_SESSIONS:
+        _sessions.popitem(last=False)
+    return session_mgr
@@ -0,0 +1,28 @@
+"""Listing of a session's generated images, shared by web routes."""
+
+import os
+from pathlib import Path
+
+
+def list_session_images(images_dir: Path) -> list[os.DirEntry]:
+    """List PNG files in a session's images directory, sorted by name.
+
+    One directory read; the returned entries cache their stat() results.
+
+    Args:
+        images_dir: Session images directory (may not exist yet)
+
+    Returns:
+        DirEntry objects for the PNG files, empty if the directory is missing
+    """
+    try:
+        with os.scandir(images_dir) as it:
+            entries = [
+                entry
+                for entry in it
+                if entry.name.endswith(".png") and not entry.name.startswith(".") and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda entry: entry.name)
+    return entries
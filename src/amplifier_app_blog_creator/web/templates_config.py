@@ -3,7 +3,21 @@
 from pathlib import Path
 
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import FileSystemLoader
 
 template_dir = Path(__file__).parent / "templates"
 template_dir.mkdir(exist_ok=True)
-templates = Jinja2Templates(directory=str(template_dir))
+
+# Compiled templates persist across restarts; templates ship with the
+# package, so there is no need to stat them for changes on every render.
+# With no directory given, Jinja uses a private per-user cache directory
+# (mode 0700, owner checked), so other local users can't plant bytecode.
+env = Environment(
+    loader=FileSystemLoader(str(template_dir)),
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+)
+templates = Jinja2Templates(env=env)
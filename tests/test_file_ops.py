@@ -0,0 +1,102 @@
+"""Tests for the vendored file operations and the shared JSON codec."""
+
+import json
+import os
+import stat
+
+import pytest
+
+from amplifier_app_blog_creator.json_codec import dumps
+from amplifier_app_blog_creator.json_codec import loads
+from amplifier_app_blog_creator.vendored_toolkit import discover_files
+from amplifier_app_blog_creator.vendored_toolkit import read_json
+from amplifier_app_blog_creator.vendored_toolkit import write_json
+
+
+class TestWriteJson:
+    """Test atomic JSON writes."""
+
+    def test_keeps_existing_mode(self, tmp_path):
+        """Test that replacing a 0600 file leaves it at 0600 with no temp file behind."""
+        path = tmp_path / "state.json"
+        path.write_text("{}")
+        os.chmod(path, 0o600)
+
+        write_json({"stage": "complete"}, path)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert read_json(path) == {"stage": "complete"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json"]
+
+    def test_new_file_gets_umask_default(self, tmp_path):
+        """Test that a new file isn't left at mkstemp's 0600."""
+        write_json({"a": 1}, tmp_path / "new.json", compact=True)
+
+        # Same mode a plain open() creates under the process umask
+        (tmp_path / "plain.json").write_text("{}")
+        assert stat.S_IMODE((tmp_path / "new.json").stat().st_mode) == stat.S_IMODE(
+            (tmp_path / "plain.json").stat().st_mode
+        )
+
+    def test_compact_output(self, tmp_path):
+        """Test compact output keeps non-ASCII text and stringifies non-string keys."""
+        path = tmp_path / "index.json"
+        write_json({"title": "café", 1: 2}, path, compact=True)
+
+        assert path.read_bytes() == '{"title":"café","1":2}'.encode()
+
+    def test_read_invalid_json(self, tmp_path):
+        """Test that invalid JSON is reported as ValueError."""
+        path = tmp_path / "bad.json"
+        path.write_text("{bad")
+        with pytest.raises(ValueError):
+            read_json(path)
+
+
+class TestJsonCodec:
+    """Test the orjson-or-stdlib JSON helpers."""
+
+    def test_round_trip(self):
+        """Test that dumps and loads round-trip nested data."""
+        data = {"message": "naïve", "stage_index": 2, "items": [1, None, True]}
+        assert loads(dumps(data)) == data
+        assert loads(dumps(data).decode("utf-8")) == data
+
+    def test_ensure_ascii(self):
+        """Test that ensure_ascii escapes non-ASCII characters."""
+        assert dumps({"k": "é"}, ensure_ascii=True) == b'{"k":"\\u00e9"}'
+
+    def test_invalid_json(self):
+        """Test that decode errors are json.JSONDecodeError with or without orjson."""
+        with pytest.raises(json.JSONDecodeError):
+            loads(b"{bad")
+
+
+class TestDiscoverFiles:
+    """Test file discovery shortcuts."""
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        for name in ("docs/blog/a.md", "docs/blog/deep/b.md", "docs/other/c.md", "top.md"):
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name)
+        return tmp_path
+
+    def test_literal_prefix(self, tree):
+        """Test that a literal directory prefix only searches under that directory."""
+        files = discover_files(tree, "docs/blog/**/*.md")
+        assert files == [tree / "docs/blog/a.md", tree / "docs/blog/deep/b.md"]
+
+    def test_missing_literal_prefix(self, tree):
+        """Test a prefix naming a directory that doesn't exist."""
+        assert discover_files(tree, "missing/**/*.md") == []
+
+    def test_literal_pattern(self, tree):
+        """Test a pattern without wildcards."""
+        assert discover_files(tree, "top.md") == [tree / "top.md"]
+        assert discover_files(tree, "absent.md") == []
+
+    def test_recursive_pattern(self, tree):
+        """Test the default recursive pattern finds every file."""
+        assert len(discover_files(tree)) == 4
@@ -3,6 +3,8 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from amplifier_app_blog_creator.session import SessionManager
 from amplifier_app_blog_creator.session import SessionState
 from amplifier_app_blog_creator.session import extract_title_from_markdown
@@ -55,6 +57,13 @@ This is the content of the post.
         assert slugify("---test---") == "test"
         assert slugify("Test-Post") == "test-post"
 
+    def test_slugify_is_cached(self):
+        """Test that repeated slugification of a title is served from the cache."""
+        slugify.cache_clear()
+        assert slugify("My Cached Title") == "my-cached-title"
+        assert slugify("My Cached Title") == "my-cached-title"
+        assert slugify.cache_info().hits == 1
+
 
 class TestSessionState:
     """Test SessionState dataclass."""
@@ -182,6 +191,54 @@ class TestSessionManager:
         assert draft_file.exists()
         assert draft_file.read_text() == draft_content
 
+    def test_state_mtime_tracks_saves(self, tmp_path):
+        """Test that state_mtime_ns matches the state file after each save."""
+        session_dir = tmp_path / "test_session"
+        manager = SessionManager(session_dir=session_dir)
+        assert manager.state_mtime_ns == manager.state_file.stat().st_mtime_ns
+
+        manager.state.current_draft = "Updated"
+        manager.save()
+        assert manager.state_mtime_ns == manager.state_file.stat().st_mtime_ns
+
+    def test_final_draft_fields_persist(self, tmp_path):
+        """Test that the approved draft's slug, path and word count survive a reload."""
+        session_dir = tmp_path / "test_session"
+        manager = SessionManager(session_dir=session_dir)
+        assert manager.state.final_slug is None
+
+        manager.state.final_slug = "my-post"
+        manager.state.final_path = str(session_dir / "my-post.md")
+        manager.state.final_word_count = 120
+        manager.save()
+
+        manager2 = SessionManager(session_dir=session_dir)
+        assert manager2.state.final_slug == "my-post"
+        assert manager2.state.final_path == str(session_dir / "my-post.md")
+        assert manager2.state.final_word_count == 120
+
+    def test_update_sets_fields_and_saves(self, tmp_path):
+        """Test that update() sets several fields and persists them in one save."""
+        session_dir = tmp_path / "test_session"
+        manager = SessionManager(session_dir=session_dir)
+
+        manager.update(idea_path="/ideas/post.md", writings_dir="/writings", additional_instructions="Be brief")
+
+        manager2 = SessionManager(session_dir=session_dir)
+        assert manager2.state.idea_path == "/ideas/post.md"
+        assert manager2.state.writings_dir == "/writings"
+        assert manager2.state.additional_instructions == "Be brief"
+
+        with pytest.raises(AttributeError):
+            manager.update(idea_path="/ideas/other.md", not_a_field=1)
+        assert manager.state.idea_path == "/ideas/post.md"
+
+        # Attributes that aren't dataclass fields are rejected too
+        for name in ("__class__", "__dict__", "save"):
+            with pytest.raises(AttributeError):
+                manager.update(**{name: None})
+        assert isinstance(manager.state, SessionState)
+
     def test_add_user_feedback(self, tmp_path):
         """Test adding user feedback."""
         session_dir = tmp_path / "test_session"
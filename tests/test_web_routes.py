@@ -0,0 +1,219 @@
+"""Tests for web routes, driven through FastAPI's TestClient."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from amplifier_app_blog_creator.session import SessionManager
+from amplifier_app_blog_creator.web.app import app
+from amplifier_app_blog_creator.web.markdown_preview import render_preview
+from amplifier_app_blog_creator.web.routes import content
+from amplifier_app_blog_creator.web.routes import progress
+from amplifier_app_blog_creator.web.routes import sessions
+from amplifier_app_blog_creator.web.routes.progress import MessageQueue
+from amplifier_app_blog_creator.web.session_cache import SESSIONS_DIR
+from amplifier_app_blog_creator.web.session_cache import is_valid_session_id
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient with sessions stored under a temporary working directory."""
+    monkeypatch.chdir(tmp_path)
+    with TestClient(app) as client:
+        yield client
+
+
+class TestDraftDownload:
+    """Test downloading the draft from the complete page."""
+
+    def test_download_without_approve(self, client):
+        """Test the review → complete → download flow when approve never ran."""
+        session_mgr = SessionManager(SESSIONS_DIR / "download_flow")
+        session_mgr.state.current_draft = "# First Title\n\nOriginal."
+        session_mgr.save()
+
+        response = client.put("/sessions/download_flow/draft", json={"content": "# Edited Title\n\nEdited."})
+        assert response.status_code == 200
+
+        response = client.get("/sessions/download_flow/complete")
+        assert response.status_code == 200
+        assert "edited-title.md" in response.text
+
+        response = client.get("/sessions/download_flow/download")
+        assert response.status_code == 200
+        assert response.text == "# Edited Title\n\nEdited."
+        assert 'filename="edited-title.md"' in response.headers["content-disposition"]
+        # A download never writes the final draft file; only approve does
+        assert not (SESSIONS_DIR / "download_flow" / "edited-title.md").exists()
+
+    def test_download_after_approve(self, client):
+        """Test that an approved draft is served from the file approve wrote."""
+        session_mgr = SessionManager(SESSIONS_DIR / "download_approved")
+        session_mgr.state.current_draft = "# Approved Post\n\nFinal words."
+        session_mgr.save()
+
+        response = client.post("/sessions/download_approved/approve")
+        assert response.status_code == 200
+        assert (SESSIONS_DIR / "download_approved" / "approved-post.md").exists()
+
+        response = client.get("/sessions/download_approved/download")
+        assert response.status_code == 200
+        assert response.text == "# Approved Post\n\nFinal words."
+
+
+class TestMarkdownPreview:
+    """Test preview sanitization."""
+
+    def test_image_style_keeps_only_sizing(self):
+        """Test that img style can size an image but not position it over the page."""
+        html = render_preview(
+            '<img src="images/a.png" style="position:fixed;top:0;width:100vw;margin:0 auto">', "style_session"
+        )
+        assert "position" not in html
+        assert "top:" not in html
+        assert "width:100vw" in html
+
+
+class TestSessionIdValidation:
+    """Test that malformed session IDs are rejected before touching the filesystem."""
+
+    @pytest.mark.parametrize("session_id", ["..", "a.b", "x" * 65])
+    def test_is_valid_session_id_rejects(self, session_id):
+        """Test IDs that could name paths outside SESSIONS_DIR."""
+        assert not is_valid_session_id(session_id)
+
+    def test_is_valid_session_id_accepts_timestamps(self):
+        """Test SessionManager's default timestamp IDs."""
+        assert is_valid_session_id("20250101_120000")
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/sessions/a.b/draft", "/sessions/a.b/download", "/sessions/a.b/progress-stream"],
+    )
+    def test_routes_return_404(self, client, path):
+        """Test that routes answer a malformed ID with a clean 404."""
+        response = client.get(path)
+        assert response.status_code == 404
+        assert not (SESSIONS_DIR / "a.b").exists()
+
+
+class TestApproveDraft:
+    """Test approving a draft while an autosave is still being written."""
+
+    def test_approve_waits_for_in_flight_save(self, client, monkeypatch):
+        """Test that the approve-time state write lands after any running autosave."""
+        monkeypatch.setattr(content, "DRAFT_SAVE_DELAY", 0)
+        writes = []
+        update_draft = SessionManager.update_draft
+        update_stage = SessionManager.update_stage
+
+        def slow_update_draft(self, draft):
+            time.sleep(0.3)
+            update_draft(self, draft)
+            writes.append("draft")
+
+        def recording_update_stage(self, stage):
+            update_stage(self, stage)
+            writes.append(stage)
+
+        monkeypatch.setattr(SessionManager, "update_draft", slow_update_draft)
+        monkeypatch.setattr(SessionManager, "update_stage", recording_update_stage)
+
+        session_mgr = SessionManager(SESSIONS_DIR / "approve_race")
+        session_mgr.save()
+
+        client.put("/sessions/approve_race/draft", json={"content": "# Raced\n\nBody."})
+        # Let the zero-delay timer start the save in its worker thread
+        time.sleep(0.1)
+        response = client.post("/sessions/approve_race/approve")
+        assert response.status_code == 200
+
+        assert writes == ["draft", "complete"]
+        state = json.loads((SESSIONS_DIR / "approve_race" / "state.json").read_text())
+        assert state["stage"] == "complete"
+        assert state["final_slug"] == "raced"
+
+
+class TestMessageQueue:
+    """Test the progress MessageQueue's per-stream cursors."""
+
+    async def test_subscribers_each_get_every_message(self):
+        """Test that two streams reading the same queue both see the full run."""
+        queue = MessageQueue()
+
+        async def subscribe() -> list[str]:
+            cursor = 0
+            received = []
+            while True:
+                await queue.wait(cursor)
+                messages, cursor = queue.read_from(cursor)
+                if messages:
+                    received.extend(str(m["message"]) for m in messages)
+                elif queue.complete:
+                    return received
+
+        subscribers = [asyncio.create_task(subscribe()) for _ in range(2)]
+        await asyncio.sleep(0)
+        for i in range(3):
+            await queue.put(f"step {i}")
+            await asyncio.sleep(0)
+        await queue.put_many([("last", None, None)])
+        queue.mark_complete()
+
+        expected = ["step 0", "step 1", "step 2", "last"]
+        assert await asyncio.gather(*subscribers) == [expected, expected]
+
+    async def test_late_subscriber_replays_history(self):
+        """Test that a stream opened mid-run (e.g. a reload) starts from the beginning."""
+        queue = MessageQueue()
+        await queue.put("first", stage="Style")
+        await queue.put("second")
+
+        messages, cursor = queue.read_from(0)
+        assert [m["message"] for m in messages] == ["first", "second"]
+        assert messages[0]["stage"] == "Style"
+        assert queue.read_from(cursor) == ([], cursor)
+
+    async def test_overflow_skips_dropped_messages(self, monkeypatch):
+        """Test that a reader behind the bounded deque gets only what is still queued."""
+        monkeypatch.setattr(progress, "MAX_QUEUED_MESSAGES", 3)
+        queue = MessageQueue()
+        for i in range(6):
+            await queue.put(str(i))
+
+        messages, cursor = queue.read_from(1)
+        assert [m["message"] for m in messages] == ["3", "4", "5"]
+        assert cursor == 6
+
+    async def test_exact_repeat_is_coalesced(self):
+        """Test that only a back-to-back identical message is dropped."""
+        queue = MessageQueue()
+        await queue.put_many([("a", None, None), ("a", None, None), ("b", None, None), ("a", None, None)])
+
+        messages, _ = queue.read_from(0)
+        assert [m["message"] for m in messages] == ["a", "b", "a"]
+
+
+class TestCountWords:
+    """Test chunked word counting for idea files."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+    def test_words_across_chunk_boundaries(self, tmp_path, monkeypatch, chunk_size):
+        """Test that words split by a chunk boundary are counted once."""
+        monkeypatch.setattr(sessions, "WORD_COUNT_CHUNK_SIZE", chunk_size)
+        path = tmp_path / "idea.md"
+        text = "# Title\n\nalpha  beta\tgamma\n delta epsilon-zeta \n\n"
+        path.write_text(text)
+
+        assert sessions._count_words(path) == len(text.split())
+
+    def test_empty_and_whitespace_only(self, tmp_path):
+        """Test files with no words."""
+        path = tmp_path / "empty.md"
+        path.write_text("")
+        assert sessions._count_words(path) == 0
+        path.write_text(" \n\t \n")
+        assert sessions._count_words(path) == 0
@@ -1,9 +1,34 @@
 """
 Pytest configuration for web UI tests.
 """
+import os
+import re
+from pathlib import Path
+
 import pytest
 
 
+@pytest.fixture(scope="session")
+def base_url():
+    """Base URL for the web application."""
+    return os.getenv("TEST_BASE_URL", "http://localhost:8000")
+
+
+@pytest.fixture(scope="session")
+def test_api_key():
+    """Test Anthropic API key."""
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        pytest.skip("ANTHROPIC_API_KEY not set - skipping E2E tests")
+    return api_key
+
+
+@pytest.fixture(scope="session")
+def test_fixtures_dir():
+    """Path to test fixtures directory."""
+    return str(Path(__file__).parent.parent.parent.parent / "amplifier-bundle-blog-creator" / "test-fixtures")
+
+
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
     """Configure browser context for tests."""
@@ -29,3 +54,43 @@ def page(context):
     page = context.new_page()
     yield page
     page.close()
+
+
+@pytest.fixture(scope="session")
+def completed_session(browser, base_url, test_api_key, test_fixtures_dir):
+    """Run the workflow once and return the ID of the session it produced.
+
+    The recipe takes minutes with real LLM calls, so review and complete
+    page tests share this session (one per xdist worker) and open its
+    pages by URL instead of each running their own workflow.
+    """
+    context = browser.new_context()
+    page = context.new_page()
+    try:
+        page.goto(f"{base_url}/configure")
+        page.get_by_label("Anthropic API Key").fill(test_api_key)
+        page.get_by_role("button", name="Continue").click()
+
+        page.get_by_label("Idea File").fill(f"{test_fixtures_dir}/idea-notes.md")
+        page.get_by_label("Writing Samples Directory").fill(f"{test_fixtures_dir}/writing-samples")
+        page.get_by_role("button", name="Start Creating").click()
+
+        # SSE sends 'complete' event which triggers redirect (may take 3-5 minutes)
+        page.wait_for_url("**/review", timeout=600000)  # 10 minute timeout
+        return re.search(r"/sessions/([^/]+)/review", page.url).group(1)
+    finally:
+        context.close()
+
+
+@pytest.fixture(scope="session")
+def approved_session(browser, base_url, completed_session):
+    """Approve the shared session's draft and return its ID."""
+    context = browser.new_context()
+    page = context.new_page()
+    try:
+        page.goto(f"{base_url}/sessions/{completed_session}/review")
+        page.get_by_role("button", name="Approve").click()
+        page.wait_for_url("**/complete", timeout=10000)
+        return completed_session
+    finally:
+        context.close()